@@ -0,0 +1,46 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from helpers import BlockType, block_to_block_type, classify_block
+
+
+def multi_scan_block_to_block_type(block):
+    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
+        return BlockType.HEADING
+    elif block.startswith("```") and block.endswith("```"):
+        return BlockType.CODE
+    elif all(line.startswith("> ") for line in block.split("\n")):
+        return BlockType.QUOTE
+    elif all(line.startswith("* ") for line in block.split("\n")):
+        return BlockType.UNORDERED_LIST
+    elif all(line.startswith("- ") for line in block.split("\n")):
+        return BlockType.UNORDERED_LIST
+    elif all(line.startswith(f"{i}. ") for i, line in enumerate(block.split("\n"), 1)):
+        return BlockType.ORDERED_LIST
+    else:
+        return BlockType.PARAGRAPH
+
+
+def main():
+    lines = 10_000
+    blocks = {
+        "dash list": "\n".join(f"- item {i}" for i in range(lines)),
+        "ordered list": "\n".join(f"{i}. item" for i in range(1, lines + 1)),
+        "paragraph": "\n".join(f"plain line {i}" for i in range(lines)),
+    }
+    print(f"{'block (10k lines)':<18} {'multi-scan ms':>14} {'single ms':>10} {'lines ms':>9} {'speedup':>8}")
+    for name, block in blocks.items():
+        split = block.split("\n")
+        assert multi_scan_block_to_block_type(block) == block_to_block_type(block)
+        old = min(timeit.repeat(lambda: multi_scan_block_to_block_type(block), number=20, repeat=5)) / 20
+        new = min(timeit.repeat(lambda: block_to_block_type(block), number=20, repeat=5)) / 20
+        # What iter_blocks pays: the lines are already split when classified.
+        presplit = min(timeit.repeat(lambda: classify_block(split), number=20, repeat=5)) / 20
+        print(f"{name:<18} {old * 1e3:>14.3f} {new * 1e3:>10.3f} {presplit * 1e3:>9.3f} {old / presplit:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
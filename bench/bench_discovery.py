@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from discovery import discover_pages
+
+
+def listdir_collect_pages(from_path, dest_path):
+    if os.path.isfile(from_path):
+        return [(from_path, os.path.splitext(dest_path)[0] + ".html")]
+    pages = []
+    if os.path.isdir(from_path):
+        for item in sorted(os.listdir(from_path)):
+            pages.extend(listdir_collect_pages(os.path.join(from_path, item), os.path.join(dest_path, item)))
+    return pages
+
+
+def make_tree(root, directories, files_per_directory):
+    for d in range(directories):
+        directory = os.path.join(root, f"section-{d:04d}")
+        os.makedirs(directory)
+        for f in range(files_per_directory):
+            open(os.path.join(directory, f"page-{f:03d}.md"), "w").close()
+        open(os.path.join(directory, ".page-000.md.swp"), "w").close()
+
+
+def best_of(function, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, 1000, 100)
+        listdir_seconds, old = best_of(lambda: listdir_collect_pages(root, "public"))
+        scandir_seconds, new = best_of(lambda: discover_pages(root, "public"))
+        print(f"{len(old)} entries listed, {len(new)} pages discovered")
+        print(f"listdir + isfile: {listdir_seconds * 1e3:8.1f} ms")
+        print(f"scandir:          {scandir_seconds * 1e3:8.1f} ms  ({listdir_seconds / scandir_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from helpers import text_to_textnodes, split_nodes_delimiter, split_nodes_image, split_nodes_link
+
+SENTENCE = "Some **bold** and *italic* text with `code`, a [link](https://boot.dev/x) and ![img](/images/a.png). "
+
+
+def chained_text_to_textnodes(text):
+    nodes = split_nodes_delimiter([TextNode(text, TextType.TEXT)], "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+def main():
+    print(f"{'sentences':>10} {'chained ms':>11} {'single ms':>10} {'speedup':>8}")
+    for sentences in (1, 10, 100, 1000):
+        paragraph = SENTENCE * sentences
+        assert chained_text_to_textnodes(paragraph) == text_to_textnodes(paragraph)
+        number = max(1, 2000 // sentences)
+        chained = min(timeit.repeat(lambda: chained_text_to_textnodes(paragraph), number=number, repeat=5)) / number
+        single = min(timeit.repeat(lambda: text_to_textnodes(paragraph), number=number, repeat=5)) / number
+        print(f"{sentences:>10} {chained * 1e3:>11.3f} {single * 1e3:>10.3f} {chained / single:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from linkcheck import check_links, live_urls
+from siteindex import SiteIndex
+
+
+def synthetic_index(pages, links_per_page):
+    index = SiteIndex()
+    for i in range(pages):
+        links = [f"/posts/{(i * 7 + j) % pages}/" for j in range(links_per_page - 3)]
+        links += ["../", "https://example.com/", f"/posts/{pages + i}"]
+        index.update(f"content/posts/{i}/index.md", {
+            "output": f"public/posts/{i}/index.html",
+            "title": f"Post {i}",
+            "links": links,
+            "images": [f"/images/{i % 100}.png"],
+            "bytes": 0,
+        })
+    return index
+
+
+def main():
+    pages, links_per_page = 20_000, 25
+    index = synthetic_index(pages, links_per_page)
+    outputs = [entry["output"] for entry in index.pages.values()]
+    outputs += [f"public/images/{i}.png" for i in range(100)]
+    start = time.perf_counter()
+    live = live_urls(outputs, "public")
+    broken = check_links(index, live, "public")
+    elapsed = time.perf_counter() - start
+    references = pages * (links_per_page + 1)
+    print(f"{pages} pages, {references} references: {elapsed * 1e3:.1f} ms, {len(broken)} broken")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import gc
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from helpers import markdown_to_html_node
+
+SECTION = """## Release {n}
+
+Some **bold** and *italic* notes with `code`, a [link](https://boot.dev/{n}) and ![img](/images/{n}.png).
+
+* Fixed *one* thing
+* Fixed **another** thing
+* Changed `config` defaults
+
+1. Upgrade
+2. Restart
+
+> Quote for release {n}
+
+"""
+
+
+def synthetic_document(megabytes: float) -> str:
+    sections = []
+    size = 0
+    n = 0
+    while size < megabytes * 1e6:
+        section = SECTION.format(n=n)
+        sections.append(section)
+        size += len(section)
+        n += 1
+    return "# Changelog\n\n" + "".join(sections)
+
+
+def count_nodes(node) -> int:
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(count_nodes(child) for child in children)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory used to parse a large synthetic page")
+    parser.add_argument("--mb", type=float, default=5.0, help="size of the synthetic document in MB")
+    args = parser.parse_args()
+
+    markdown = synthetic_document(args.mb)
+    # Peak RSS is taken from an untraced parse; tracemalloc's own
+    # bookkeeping would otherwise dominate it.
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    root = markdown_to_html_node(markdown)
+    elapsed = time.perf_counter() - start
+    nodes = count_nodes(root)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    del root
+    gc.collect()
+
+    tracemalloc.start()
+    root = markdown_to_html_node(markdown)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    live_blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    live_bytes = sum(stat.size for stat in snapshot.statistics("filename"))
+    print(f"document        {len(markdown) / 1e6:10.2f} MB")
+    print(f"nodes           {nodes:10d}")
+    print(f"parse time      {elapsed:10.2f} s")
+    print(f"live blocks     {live_blocks:10d}")
+    print(f"live bytes      {live_bytes / 1e6:10.2f} MB")
+    print(f"traced peak     {peak / 1e6:10.2f} MB")
+    print(f"peak RSS        {peak_rss:10.2f} MB ({peak_rss - baseline_rss:.2f} MB for the parse)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import PATHOLOGICAL_KINDS, page, pathological_page
+from helpers import markdown_to_html_node
+
+# Worst-case pages must render within this multiple of a normal page of the
+# same size, measured per byte.
+MAX_SLOWDOWN = 10
+
+
+def seconds_per_byte(markdown: str, repeat: int=3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        markdown_to_html_node(markdown).to_html()
+        best = min(best, time.perf_counter() - start)
+    return best / len(markdown)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 256 * 1024
+    normal = page(random.Random(1), sections=1)
+    normal = normal * (size // len(normal))
+    baseline = seconds_per_byte(normal)
+    print(f"normal page: {len(normal)} bytes, {baseline * len(normal) * 1e3:.1f} ms")
+    failed = []
+    for kind in PATHOLOGICAL_KINDS:
+        markdown = pathological_page(kind, size)
+        ratio = seconds_per_byte(markdown) / baseline
+        print(f"{kind:<16} {len(markdown):>9} bytes {ratio:>6.2f}x normal")
+        if ratio > MAX_SLOWDOWN:
+            failed.append(kind)
+    if failed:
+        sys.exit(f"slower than {MAX_SLOWDOWN}x a normal page: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import textnode
+from helpers import text_to_textnodes
+from htmlnode import LeafNode
+
+PARAGRAPH = "Some **bold** and *italic* text with `code`, plain words and a [link](https://boot.dev/x). " * 20
+
+
+def leaf_node_html(nodes):
+    return "".join(textnode.text_node_to_html_node(node).to_html() for node in nodes)
+
+
+def fast_path_html(nodes):
+    return "".join(node.to_html() for node in nodes)
+
+
+def count_leaf_nodes(render, nodes):
+    built = 0
+
+    def counting_leaf_node(*args, **kwargs):
+        nonlocal built
+        built += 1
+        return LeafNode(*args, **kwargs)
+
+    textnode.LeafNode = counting_leaf_node
+    try:
+        render(nodes)
+    finally:
+        textnode.LeafNode = LeafNode
+    return built
+
+
+def main():
+    nodes = text_to_textnodes(PARAGRAPH)
+    assert leaf_node_html(nodes) == fast_path_html(nodes)
+    print(f"paragraph: {len(nodes)} inline nodes, {len(fast_path_html(nodes))} bytes of HTML")
+    # Every LeafNode also costs its instance and, for links, a props dict.
+    print(f"{'path':<10} {'LeafNodes':>10} {'us/para':>9}")
+    for name, render in (("leaf node", leaf_node_html), ("fast path", fast_path_html)):
+        seconds = min(timeit.repeat(lambda: render(nodes), number=2000, repeat=5)) / 2000
+        print(f"{name:<10} {count_leaf_nodes(render, nodes):>10} {seconds * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
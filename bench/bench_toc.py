@@ -0,0 +1,57 @@
+import os
+import random
+import statistics
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import toc
+from corpus import inline_text, page, words
+from helpers import markdown_to_html_node
+from toc import TableOfContents
+
+
+def heading_dense_page(sections: int=500, seed: int=5) -> str:
+    rng = random.Random(seed)
+    blocks = [f"# {words(rng, 3)}"]
+    for i in range(sections):
+        blocks.append(f"{'#' * (i % 3 + 2)} {words(rng, 4)}")
+        blocks.append(inline_text(rng, 3))
+    return "\n\n".join(blocks)
+
+
+def render(markdown: str, with_toc: bool) -> str:
+    toc.active = TableOfContents() if with_toc else None
+    try:
+        html = markdown_to_html_node(markdown).to_html()
+        if with_toc:
+            toc.active.to_node().to_html()
+        return html
+    finally:
+        toc.active = None
+
+
+def compare(name: str, markdown: str, runs: int=300):
+    # Paired single runs in alternating order, so both variants see the same
+    # machine noise; the median of the per-pair ratios is far steadier here
+    # than comparing batch averages.
+    plain, with_toc, ratios = float("inf"), float("inf"), []
+    for i in range(runs):
+        times = {}
+        for flag in ((False, True) if i % 2 else (True, False)):
+            times[flag] = timeit.timeit(lambda: render(markdown, flag), number=1)
+        plain = min(plain, times[False])
+        with_toc = min(with_toc, times[True])
+        ratios.append(times[True] / times[False])
+    print(f"{name:<28} {plain * 1e3:>9.2f} {with_toc * 1e3:>9.2f} {(statistics.median(ratios) - 1) * 100:>+8.1f}%")
+
+
+def main():
+    print(f"{'page':<28} {'plain ms':>9} {'toc ms':>9} {'extra':>9}")
+    compare("heading per paragraph", heading_dense_page())
+    compare("heading per section", page(random.Random(6), sections=500))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import os
+import random
+
+WORDS = (
+    "the ring of power was forged in secret by sauron in the fires of mount doom "
+    "elves dwarves men hobbits wizard journey mountain river forest shadow light"
+).split()
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def inline_text(rng: random.Random, spans: int) -> str:
+    parts = []
+    for i in range(spans):
+        parts.append(words(rng, rng.randint(2, 6)))
+        kind = rng.randrange(5)
+        if kind == 0:
+            parts.append(f"**{words(rng, 2)}**")
+        elif kind == 1:
+            parts.append(f"*{words(rng, 2)}*")
+        elif kind == 2:
+            parts.append(f"`{rng.choice(WORDS)}()`")
+        elif kind == 3:
+            parts.append(f"[{words(rng, 2)}](/pages/{rng.choice(WORDS)}-{i})")
+        else:
+            parts.append(f"![{words(rng, 2)}](/images/{rng.choice(WORDS)}.png)")
+    return " ".join(parts)
+
+
+def page(rng: random.Random, sections: int, inline_spans: int=4, list_items: int=4) -> str:
+    out = [f"# {words(rng, 3).title()}\n"]
+    for _ in range(sections):
+        out.append(f"## {words(rng, 4)}\n")
+        out.append(inline_text(rng, inline_spans) + "\n")
+        out.append("\n".join(f"* {inline_text(rng, 1)}" for _ in range(list_items)) + "\n")
+        out.append("\n".join(f"{i}. {words(rng, 5)}" for i in range(1, list_items + 1)) + "\n")
+        out.append(f"> {words(rng, 12)}\n")
+        out.append(f"```\ndef {rng.choice(WORDS)}():\n    return {rng.randint(0, 99)}\n```\n")
+    return "\n".join(out)
+
+
+def small_pages(count: int=500, seed: int=1) -> dict[str, str]:
+    rng = random.Random(seed)
+    return {f"small/page{i}.md": page(rng, sections=3) for i in range(count)}
+
+
+def huge_pages(count: int=2, sections: int=4000, seed: int=2) -> dict[str, str]:
+    rng = random.Random(seed)
+    return {f"huge/page{i}.md": page(rng, sections=sections) for i in range(count)}
+
+
+def long_lists(count: int=20, items: int=2000, seed: int=3) -> dict[str, str]:
+    # The parser has no indented sub-lists, so "deep" lists are very long
+    # list blocks, which is what stresses the per-line block handling.
+    rng = random.Random(seed)
+    return {f"lists/page{i}.md": page(rng, sections=2, list_items=items) for i in range(count)}
+
+
+def inline_heavy(count: int=50, spans: int=400, seed: int=4) -> dict[str, str]:
+    rng = random.Random(seed)
+    pages = {}
+    for i in range(count):
+        paragraphs = "\n\n".join(inline_text(rng, spans) for _ in range(10))
+        pages[f"inline/page{i}.md"] = f"# Inline {i}\n\n{paragraphs}\n"
+    return pages
+
+
+# Inputs that made the old regex tokenizer backtrack quadratically, plus
+# block-level shapes (deep quotes, fence-only lines, heading runs) that a
+# rescanning classifier would pay for repeatedly.
+PATHOLOGICAL_LINES = {
+    "open_brackets": "[a ",
+    "open_images": "![a ",
+    "unclosed_links": "[a](b ",
+    "unclosed_images": "![a](b ",
+    "bang_brackets": "![",
+    "stars": "*a ",
+    "double_stars": "**a ",
+    "backticks": "`a ",
+    "mixed": "[a *b `c ![d](e ",
+}
+
+
+def pathological_page(kind: str, size: int) -> str:
+    if kind == "nested_quotes":
+        lines, total = [], 0
+        while total < size:
+            lines.append(">" * (len(lines) % 200 + 1) + " quoted")
+            total += len(lines[-1]) + 1
+        return "# Quotes\n\n" + "\n".join(lines) + "\n"
+    if kind == "fences":
+        return "# Fences\n\n" + "```\n" * (size // 4) + "\n"
+    if kind == "headings":
+        return "# Headings\n\n" + "\n\n".join("#" * (i % 9 + 1) + " h" for i in range(size // 8)) + "\n"
+    unit = PATHOLOGICAL_LINES[kind]
+    return f"# {kind}\n\n" + unit * (size // len(unit)) + "\n"
+
+
+PATHOLOGICAL_KINDS = (*PATHOLOGICAL_LINES, "nested_quotes", "fences", "headings")
+
+
+def pathological(size: int=64 * 1024) -> dict[str, str]:
+    return {f"stress/{kind}.md": pathological_page(kind, size) for kind in PATHOLOGICAL_KINDS}
+
+
+CORPORA = {
+    "small_pages": small_pages,
+    "huge_pages": huge_pages,
+    "long_lists": long_lists,
+    "inline_heavy": inline_heavy,
+    "pathological": pathological,
+}
+
+
+def write_corpus(pages: dict[str, str], root: str):
+    for path, markdown in pages.items():
+        full_path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(markdown)
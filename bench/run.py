@@ -0,0 +1,109 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CORPORA, write_corpus
+from helpers import (
+    BlockType,
+    block_to_block_type,
+    generate_pages_recursive,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    text_to_textnodes,
+)
+
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_corpus(pages: dict[str, str], repeat: int) -> dict[str, dict[str, float]]:
+    markdowns = list(pages.values())
+    total_bytes = sum(len(markdown.encode()) for markdown in markdowns)
+    blocks = [block for markdown in markdowns for block in markdown_to_blocks(markdown)]
+    paragraphs = [block for block in blocks if block_to_block_type(block) == BlockType.PARAGRAPH]
+    nodes = [markdown_to_html_node(markdown) for markdown in markdowns]
+
+    def generate():
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            template = os.path.join(tmp, "template.html")
+            write_corpus(pages, content)
+            with open(template, "w") as f:
+                f.write(TEMPLATE)
+            start = time.perf_counter()
+            generate_pages_recursive(content, template, os.path.join(tmp, "public"))
+            return time.perf_counter() - start
+
+    timings = {
+        "markdown_to_blocks": best_time(lambda: [markdown_to_blocks(m) for m in markdowns], repeat),
+        "block_to_block_type": best_time(lambda: [block_to_block_type(b) for b in blocks], repeat),
+        "text_to_textnodes": best_time(lambda: [text_to_textnodes(p) for p in paragraphs], repeat),
+        "markdown_to_html_node": best_time(lambda: [markdown_to_html_node(m) for m in markdowns], repeat),
+        "to_html": best_time(lambda: [node.to_html() for node in nodes], repeat),
+        "generate_pages_recursive": min(generate() for _ in range(repeat)),
+    }
+    paragraph_bytes = sum(len(p.encode()) for p in paragraphs)
+    results = {}
+    for name, seconds in timings.items():
+        measured_bytes = paragraph_bytes if name == "text_to_textnodes" else total_bytes
+        results[name] = {
+            "seconds": seconds,
+            "mb_per_s": measured_bytes / seconds / 1e6 if seconds else 0.0,
+            "pages_per_s": len(markdowns) / seconds if seconds else 0.0,
+        }
+    return results
+
+
+def format_results(results: dict, baseline: dict=None) -> str:
+    lines = [f"{'corpus':<14} {'benchmark':<26} {'seconds':>9} {'MB/s':>8} {'pages/s':>10} {'vs base':>8}"]
+    for corpus, benches in results.items():
+        for name, stats in benches.items():
+            ratio = ""
+            if baseline is not None and name in baseline.get(corpus, {}):
+                ratio = f"{baseline[corpus][name]['seconds'] / stats['seconds']:.2f}x"
+            lines.append(
+                f"{corpus:<14} {name:<26} {stats['seconds']:>9.4f} {stats['mb_per_s']:>8.2f} "
+                f"{stats['pages_per_s']:>10.1f} {ratio:>8}"
+            )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the markdown pipeline on synthetic corpora")
+    parser.add_argument("--corpus", action="append", choices=sorted(CORPORA), help="corpus to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the best is reported")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON written by --save; reports speedup against it")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.corpus or list(CORPORA):
+        results[name] = bench_corpus(CORPORA[name](), args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+    print(format_results(results, baseline))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl request number for a copy-on-write clone on Linux (btrfs, xfs, ...).
+FICLONE = 0x40049409
+
+
+def collect_static(from_path: str, dest_path: str) -> List[tuple[str, str]]:
+    files = []
+    for root, dirs, names in os.walk(from_path):
+        dirs.sort()
+        relative_root = os.path.relpath(root, from_path)
+        for name in sorted(names):
+            files.append((os.path.join(root, name), os.path.normpath(os.path.join(dest_path, relative_root, name))))
+    return files
+
+
+def is_up_to_date(src: str, dest: str) -> bool:
+    try:
+        src_stat = os.stat(src)
+        dest_stat = os.stat(dest)
+    except FileNotFoundError:
+        return False
+    if os.path.samestat(src_stat, dest_stat):
+        return True
+    # Outputs keep the source mtime (hardlink, clone or copy2), so equal
+    # size and mtime means the asset has not changed since it was placed.
+    return src_stat.st_size == dest_stat.st_size and src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def place_file(src: str, dest: str, link: bool=True) -> str:
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_path = dest + ".tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    if link:
+        try:
+            os.link(src, tmp_path)
+            os.replace(tmp_path, dest)
+            return "linked"
+        except OSError:
+            pass
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as src_file, open(tmp_path, "wb") as dest_file:
+                fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+            shutil.copystat(src, tmp_path)
+            os.replace(tmp_path, dest)
+            return "cloned"
+        except OSError:
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+    shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dest)
+    return "copied"
+
+
+def sync_static(
+        from_path: str,
+        dest_path: str,
+        workers: int=8,
+        link: bool=True
+        ) -> tuple[List[tuple[str, str]], dict[str, int]]:
+    files = collect_static(from_path, dest_path)
+    pending = [(src, dest) for src, dest in files if not is_up_to_date(src, dest)]
+    stats = {"static_skipped": len(files) - len(pending), "linked": 0, "cloned": 0, "copied": 0}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for method in pool.map(lambda pair: place_file(pair[0], pair[1], link), pending):
+            stats[method] += 1
+    stats["static_copied"] = len(pending)
+    return files, stats
+
+
+def prune_outputs(dest_path: str, live_outputs: set[str]) -> int:
+    removed = 0
+    for root, dirs, names in os.walk(dest_path, topdown=False):
+        for name in names:
+            path = os.path.normpath(os.path.join(root, name))
+            if path not in live_outputs:
+                os.remove(path)
+                removed += 1
+        if root != dest_path and not os.listdir(root):
+            os.rmdir(root)
+    return removed
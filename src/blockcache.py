@@ -0,0 +1,72 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import List
+from manifest import load_json, save_json
+
+# Bump whenever the HTML produced for a block changes, so stale fragments
+# written by an older renderer are discarded instead of spliced in.
+RENDERER_VERSION = "4"
+BLOCK_CACHE_PATH = os.path.join(".build", "blocks.json")
+
+
+class BlockCache:
+    def __init__(
+            self,
+            path: str=BLOCK_CACHE_PATH,
+            max_bytes: int=64 * 1024 * 1024,
+            version: str=RENDERER_VERSION
+            ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version
+        # Each entry is [html, links, images] for one rendered block.
+        self.entries: OrderedDict[str, list] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # Mixed into every key; set when rendered output depends on more than
+        # the block source, e.g. the fingerprinted asset URLs or image sizes of a build.
+        self.salt = ""
+
+    def key(self, lines: List[str]) -> str:
+        digest = hashlib.sha256("\n".join(lines).encode())
+        if self.salt:
+            digest.update(self.salt.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> list | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: list):
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key)[0])
+        self.entries[key] = entry
+        self.size += len(entry[0])
+        while self.size > self.max_bytes and self.entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted[0])
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def load(self) -> 'BlockCache':
+        data = load_json(self.path, {})
+        if data.get("version") != self.version:
+            return self
+        for key, entry in data.get("entries", []):
+            self.put(key, entry)
+        return self
+
+    def save(self):
+        save_json(self.path, {"version": self.version, "entries": list(self.entries.items())})
+
+    def __repr__(self):
+        return f"BlockCache({len(self.entries)} entries, {self.size} bytes, {self.hits} hits, {self.misses} misses)"
@@ -0,0 +1,167 @@
+import os
+from typing import Iterable, List
+from assets import prune_outputs, sync_static
+from discovery import DEFAULT_IGNORE
+from helpers import collect_pages
+from manifest import Manifest, MANIFEST_PATH, file_hash
+from parallel import render_pages
+from shard import select_shard
+from blockcache import BlockCache
+from compress import compress_outputs
+from siteindex import SiteIndex, index_path_for
+from linkcheck import check_links, live_urls
+from fingerprint import ASSET_MANIFEST, fingerprint_static, urls_digest
+from imagesize import ImageSizeCache, measure_static, sizes_digest, sizes_path_for
+import fingerprint
+import imagesize
+import profiling
+
+
+def build_site(
+        content_path: str,
+        static_path: str,
+        template_path: str,
+        dest_path: str,
+        incremental: bool=False,
+        manifest_path: str=MANIFEST_PATH,
+        workers: int=1,
+        cache: BlockCache=None,
+        static_workers: int=8,
+        writer_threads: int=0,
+        fingerprint_assets: bool=False,
+        index_path: str=None,
+        compress: bool=False,
+        shard: tuple[int, int]=None,
+        shard_plan: str="hash",
+        ignore: Iterable[str]=DEFAULT_IGNORE
+        ) -> dict[str, int]:
+    if cache is not None and workers > 1:
+        # The cache lives in this process; pool workers would render without
+        # it and its hit and miss counts would stay empty.
+        raise ValueError("a block cache needs workers=1, pool workers cannot share it")
+    if index_path is None:
+        index_path = index_path_for(manifest_path)
+    # A full build re-renders every page, but the previous build's records
+    # still let it skip rehashing unchanged assets and recompressing
+    # unchanged outputs.
+    previous = Manifest.load(manifest_path)
+    old = previous if incremental else Manifest()
+    # Pages skipped by an incremental build keep their previous index entry.
+    index = SiteIndex.load(index_path) if incremental else SiteIndex()
+    os.makedirs(dest_path, exist_ok=True)
+    new = Manifest(template=file_hash(template_path))
+
+    stats = {"pages_built": 0, "pages_skipped": 0, "removed": 0}
+
+    # Assets are compared by size and mtime against their output rather than
+    # hashed, so an unchanged multi-GB static tree costs one stat per file.
+    with profiling.stage("static_sync", trace=True):
+        static_files, static_stats = sync_static(static_path, dest_path, static_workers)
+    stats.update(static_stats)
+    if fingerprint_assets:
+        with profiling.stage("fingerprint", trace=True):
+            urls, new.static = fingerprint_static(static_files, dest_path, previous.static)
+        new.assets = urls_digest(urls)
+    else:
+        urls = None
+        for src, dest in static_files:
+            new.static[src] = {"output": dest}
+    # Image headers are re-read only for files whose size or mtime changed.
+    with profiling.stage("image_sizes", trace=True):
+        size_cache = ImageSizeCache.load(sizes_path_for(manifest_path))
+        sizes = measure_static(static_files, dest_path, size_cache)
+    new.images = sizes_digest(sizes)
+    stats["image_sizes"] = sizes
+    # Every page embeds the template, the asset URLs and the image sizes, so
+    # a change to any of them invalidates them all.
+    rebuild_all = new.template != old.template or new.assets != old.assets or new.images != old.images
+
+    pending = []
+    with profiling.stage("plan_pages", trace=True):
+        pages = collect_pages(content_path, dest_path, ignore)
+        # Links may point at pages rendered by other shards, so they are
+        # checked against the whole site rather than this shard's pages.
+        site_outputs = [dest for _, dest in pages]
+        if shard is not None:
+            pages = select_shard(pages, content_path, *shard, shard_plan)
+        for src, dest in pages:
+            digest = file_hash(src)
+            new.pages[src] = {"hash": digest, "output": dest}
+            entry = old.pages.get(src)
+            if not rebuild_all and entry is not None and entry["hash"] == digest and entry["output"] == dest and os.path.exists(dest):
+                stats["pages_skipped"] += 1
+                continue
+            pending.append((src, dest))
+    fingerprint.active = urls
+    imagesize.active = sizes
+    if cache is not None:
+        cache.salt = (new.assets or "") + new.images
+    over_budget = {}
+    try:
+        with profiling.stage("render_pages", trace=True):
+            stats["workers"] = render_pages(pending, template_path, workers, cache=cache, writer_threads=writer_threads, index=index, over_budget=over_budget)
+    finally:
+        fingerprint.active = None
+        imagesize.active = None
+    # Pages over the budget have no output; leaving them out of the manifest
+    # removes any stale output and retries them on the next build.
+    for src in over_budget:
+        site_outputs.remove(new.pages.pop(src)["output"])
+    stats["over_budget"] = over_budget
+    stats["pages_built"] = len(pending) - len(over_budget)
+    stats["pages_unchanged"] = sum(worker["unchanged"] for worker in stats["workers"].values())
+
+    stats["compressed"] = 0
+    if compress:
+        outputs = [output for entry in (*new.pages.values(), *new.static.values()) for output in entry_outputs(entry)]
+        with profiling.stage("compress", trace=True):
+            new.compressed, stats["compressed"] = compress_outputs(outputs, previous.compressed)
+
+    with profiling.stage("remove_orphans", trace=True):
+        stats["removed"] += remove_stale_outputs(dest_path, incremental, old, new)
+
+    index.retain(new.pages)
+    index.save(index_path)
+    stats["index"] = index
+    # Every page and asset of this build is in the manifest, so links are
+    # resolved against an in-memory set instead of stat-ing the output tree.
+    with profiling.stage("check_links", trace=True):
+        live = live_urls([*site_outputs, *(entry["output"] for entry in new.static.values())], dest_path)
+        stats["broken_links"] = check_links(index, live, dest_path)
+    size_cache.save(sizes_path_for(manifest_path))
+    new.save(manifest_path)
+    return stats
+
+
+def remove_stale_outputs(dest_path: str, incremental: bool, old: Manifest, new: Manifest) -> int:
+    if incremental:
+        removed = remove_orphans(old.static, new.static) + remove_orphans(old.pages, new.pages) + remove_orphans(old.compressed, new.compressed)
+        if new.assets is None and old.assets is not None:
+            removed += remove_file(os.path.join(dest_path, ASSET_MANIFEST))
+        return removed
+    live_outputs = {os.path.normpath(output) for entry in (*new.static.values(), *new.pages.values(), *new.compressed.values()) for output in entry_outputs(entry)}
+    if new.assets is not None:
+        live_outputs.add(os.path.normpath(os.path.join(dest_path, ASSET_MANIFEST)))
+    return prune_outputs(dest_path, live_outputs)
+
+
+def entry_outputs(entry: dict[str, str]) -> List[str]:
+    return [entry[key] for key in ("output", "fingerprinted", "gz", "br") if key in entry]
+
+
+def remove_orphans(old_entries: dict[str, dict[str, str]], new_entries: dict[str, dict[str, str]]) -> int:
+    live_outputs = {output for entry in new_entries.values() for output in entry_outputs(entry)}
+    removed = 0
+    for entry in old_entries.values():
+        for output in entry_outputs(entry):
+            if output not in live_outputs:
+                removed += remove_file(output)
+    return removed
+
+
+def remove_file(path: str) -> int:
+    if os.path.isfile(path):
+        os.remove(path)
+        return 1
+    return 0
+
@@ -0,0 +1,90 @@
+import gzip
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List
+from manifest import file_hash
+from writer import write_if_changed
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {".html", ".css", ".js", ".mjs", ".json", ".svg", ".xml", ".txt", ".map"}
+# Below this size the saved bytes are smaller than a response header.
+MIN_SIZE = 256
+# A sibling is only kept when it is at most this fraction of the original.
+MAX_RATIO = 0.9
+
+
+def is_compressible(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def is_current(path: str, entry: dict) -> bool:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return False
+    if entry is None or entry["size"] != stat.st_size:
+        return False
+    if entry["mtime"] != stat.st_mtime_ns:
+        # A full build rewrites every page, so a new mtime alone does not mean
+        # new content; hashing is far cheaper than gzip -9 and brotli -11.
+        if "hash" not in entry or file_hash(path) != entry["hash"]:
+            return False
+        entry["mtime"] = stat.st_mtime_ns
+    return all(os.path.exists(entry[key]) for key in ("gz", "br") if key in entry)
+
+
+def compress_file(path: str, use_brotli: bool=True) -> dict:
+    stat = os.stat(path)
+    entry = {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+    if stat.st_size < MIN_SIZE:
+        return entry
+    with open(path, "rb") as f:
+        data = f.read()
+    entry["hash"] = hashlib.sha256(data).hexdigest()
+    # mtime=0 keeps the gzip header, and so the sibling, reproducible.
+    encoders = [("gz", lambda data: gzip.compress(data, 9, mtime=0))]
+    if use_brotli and brotli is not None:
+        encoders.append(("br", lambda data: brotli.compress(data, quality=11)))
+    for key, encode in encoders:
+        sibling = f"{path}.{key}"
+        compressed = encode(data)
+        if len(compressed) <= len(data) * MAX_RATIO:
+            write_if_changed(sibling, compressed)
+            entry[key] = sibling
+        elif os.path.exists(sibling):
+            os.remove(sibling)
+    return entry
+
+
+def compress_outputs(
+        outputs: List[str],
+        previous: dict[str, dict]=None,
+        workers: int=None,
+        use_brotli: bool=True
+        ) -> tuple[dict[str, dict], int]:
+    previous = previous if previous is not None else {}
+    entries = {}
+    pending = []
+    for path in outputs:
+        if not is_compressible(path):
+            continue
+        entry = previous.get(path)
+        if is_current(path, entry):
+            entries[path] = entry
+        else:
+            pending.append(path)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(pending) <= 1:
+        results = [compress_file(path, use_brotli) for path in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(partial(compress_file, use_brotli=use_brotli), pending, chunksize=max(1, len(pending) // (workers * 4))))
+    entries.update(zip(pending, results))
+    return entries, len(pending)
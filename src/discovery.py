@@ -0,0 +1,74 @@
+import fnmatch
+import os
+import re
+from typing import Iterable, List
+
+PAGE_EXTENSIONS = (".md",)
+# Hidden files, editor swap and backup files, and _drafts.
+DEFAULT_IGNORE = (".*", "*~", "*.swp", "*.swo", "#*#", "_*")
+
+
+def compile_ignore(patterns: Iterable[str]) -> re.Pattern | None:
+    # One alternation is matched per entry instead of one fnmatch per pattern.
+    # Patterns with a "/" match the path relative to the content root, the
+    # rest match the bare name at any depth.
+    translated = [fnmatch.translate(pattern.strip("/")) for pattern in patterns]
+    if not translated:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in translated))
+
+
+def is_ignored(ignore: re.Pattern | None, name: str, relative_path: str) -> bool:
+    return ignore is not None and (ignore.match(name) is not None or ignore.match(relative_path) is not None)
+
+
+def is_page(
+        relative_path: str,
+        ignore: Iterable[str]=DEFAULT_IGNORE,
+        extensions: tuple[str, ...]=PAGE_EXTENSIONS
+        ) -> bool:
+    pattern = compile_ignore(ignore)
+    parts = relative_path.replace(os.sep, "/").split("/")
+    if any(is_ignored(pattern, name, "/".join(parts[:i + 1])) for i, name in enumerate(parts)):
+        return False
+    return relative_path.endswith(extensions)
+
+
+def discover_pages(
+        from_path: str,
+        dest_path: str,
+        ignore: Iterable[str]=DEFAULT_IGNORE,
+        extensions: tuple[str, ...]=PAGE_EXTENSIONS
+        ) -> List[tuple[str, str]]:
+    if not os.path.isdir(from_path):
+        if os.path.isfile(from_path):
+            return [(from_path, os.path.splitext(dest_path)[0] + ".html")]
+        return []
+    pattern = compile_ignore(ignore)
+    pages = []
+    # (directory, path relative to from_path) pairs still to scan.
+    stack = [(from_path, "")]
+    while stack:
+        directory, relative_dir = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative_path = relative_dir + entry.name
+                if is_ignored(pattern, entry.name, relative_path):
+                    continue
+                # DirEntry answers from the d_type readdir already returned,
+                # so no stat is issued for ordinary files and directories.
+                if entry.is_dir():
+                    stack.append((entry.path, relative_path + "/"))
+                elif entry.name.endswith(extensions) and entry.is_file():
+                    pages.append(relative_path)
+    pages.sort()
+    # Plain concatenation: os.path.join and splitext per page cost more than
+    # the scan itself on large trees.
+    src_prefix = os.path.join(from_path, "")
+    dest_prefix = os.path.join(dest_path, "")
+    work = []
+    for relative_path in pages:
+        if os.sep != "/":
+            relative_path = relative_path.replace("/", os.sep)
+        work.append((src_prefix + relative_path, dest_prefix + relative_path.rpartition(".")[0] + ".html"))
+    return work
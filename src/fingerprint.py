@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import re
+from typing import List
+from assets import place_file
+from manifest import file_hash, save_json, stat_unchanged
+
+ASSET_MANIFEST = "asset-manifest.json"
+URL_ATTRIBUTE_PATTERN = re.compile(r'\b(href|src)="([^"]*)"')
+
+# Maps site URLs of static assets ("/index.css") to their fingerprinted
+# URLs ("/index.3f2a9c01d4.css") while a fingerprinted build is running.
+active: dict[str, str] | None = None
+
+
+def fingerprint_name(path: str, digest: str) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest[:10]}{ext}"
+
+
+def fingerprint_static(
+        static_files: List[tuple[str, str]],
+        dest_path: str,
+        previous: dict[str, dict[str, str]]=None
+        ) -> tuple[dict[str, str], dict[str, dict[str, str]]]:
+    previous = previous if previous is not None else {}
+    urls = {}
+    entries = {}
+    for src, dest in static_files:
+        stat = os.stat(src)
+        entry = previous.get(src)
+        if entry is not None and "hash" in entry and stat_unchanged(stat, entry.get("size"), entry.get("mtime")):
+            digest = entry["hash"]
+        else:
+            digest = file_hash(src)
+        hashed_dest = fingerprint_name(dest, digest)
+        if not os.path.exists(hashed_dest):
+            place_file(src, hashed_dest)
+        url = "/" + os.path.relpath(dest, dest_path).replace(os.sep, "/")
+        urls[url] = fingerprint_name(url, digest)
+        entries[src] = {"output": dest, "fingerprinted": hashed_dest, "hash": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+    save_json(os.path.join(dest_path, ASSET_MANIFEST), urls, indent=1, sort_keys=True)
+    return urls, entries
+
+
+def urls_digest(urls: dict[str, str]) -> str:
+    return hashlib.sha256(json.dumps(urls, sort_keys=True).encode()).hexdigest()
+
+
+def resolve(url: str) -> str:
+    if active is None:
+        return url
+    return active.get(url, url)
+
+
+def rewrite_urls(html: str, urls: dict[str, str]) -> str:
+    return URL_ATTRIBUTE_PATTERN.sub(lambda match: f'{match.group(1)}="{urls.get(match.group(2), match.group(2))}"', html)
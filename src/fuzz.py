@@ -0,0 +1,283 @@
+import argparse
+import io
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+import reference
+from blockcache import BlockCache
+from helpers import iter_blocks, markdown_to_html_node, render_blocks, text_to_textnodes
+from htmlnode import ParentNode
+
+# INPUT_CLASSES generate markdown both pipelines must render identically.
+# Where the optimized parser deliberately differs from the reference, the
+# DIVERGENT_CLASSES generate exactly those inputs and check the optimized
+# output against the behaviour specified for each class instead.
+WORDS = "the ring was forged in secret fire elves dwarves men wizard road river shadow light 42 x-ray a.b e=mc2 <b> &amp;".split()
+URLS = ["/", "/blog/", "https://example.com/a?b=c", "/images/a.png", "../up.html"]
+# Stands in for a divergent piece when the reference renders the document.
+PLACEHOLDER = "fuzzplaceholder"
+# The one intended change in output format since the reference was frozen:
+# <img> is a void element with the alt text and loading hints as attributes.
+REFERENCE_IMG = re.compile(r'<img src="([^"]*)">(.*?)</img>')
+
+
+def words(rng: random.Random, low: int=1, high: int=6) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def span(rng: random.Random) -> str:
+    kind = rng.randrange(6)
+    if kind == 0:
+        return f"**{words(rng, 1, 3)}**"
+    if kind == 1:
+        return f"*{words(rng, 1, 3)}*"
+    if kind == 2:
+        return f"`{words(rng, 1, 3)}`"
+    if kind == 3:
+        return f"[{words(rng, 1, 3)}]({rng.choice(URLS)})"
+    if kind == 4:
+        return f"![{words(rng, 1, 3)}]({rng.choice(URLS)})"
+    if kind == 5 and rng.random() < 0.3:
+        # Links inside emphasis and code stay literal in both pipelines.
+        wrapper = rng.choice(("**", "*", "`"))
+        return f"{wrapper}[{words(rng, 1, 2)}]({rng.choice(URLS)}){wrapper}"
+    return words(rng)
+
+
+def inline(rng: random.Random, spans: int=None) -> str:
+    if spans is None:
+        spans = rng.randint(1, 8)
+    separators = (" ", " ", ", ", ". ")
+    return "".join(span(rng) + rng.choice(separators) for _ in range(spans)).strip()
+
+
+def block(rng: random.Random) -> str:
+    kind = rng.randrange(7)
+    if kind == 0:
+        return "#" * rng.randint(1, 6) + " " + inline(rng, 3)
+    if kind == 1:
+        return "\n".join(["```", *(words(rng) for _ in range(rng.randint(1, 4))), "```"])
+    if kind == 2:
+        return "\n".join("> " + inline(rng, 3) for _ in range(rng.randint(1, 4)))
+    if kind == 3:
+        marker = rng.choice("*-")
+        return "\n".join(f"{marker} {inline(rng, 3)}" for _ in range(rng.randint(1, 6)))
+    if kind == 4:
+        return "\n".join(f"{i}. {inline(rng, 3)}" for i in range(1, rng.randint(2, 7)))
+    return "\n".join(inline(rng) for _ in range(rng.randint(1, 3)))
+
+
+def grammar_document(rng: random.Random) -> str:
+    return "\n\n".join(block(rng) for _ in range(rng.randint(1, 12)))
+
+
+def inline_document(rng: random.Random) -> str:
+    return inline(rng, rng.randint(20, 200))
+
+
+def list_document(rng: random.Random) -> str:
+    return "\n\n".join(rng.choice((block(rng), "\n".join(f"- {inline(rng, 2)}" for _ in range(rng.randint(20, 200))))) for _ in range(3))
+
+
+def random_document(rng: random.Random) -> str:
+    # Token soup: safe pieces joined with random whitespace, so block
+    # boundaries, stray indentation and blank-line runs land anywhere.
+    # Headings are left to the grammar, since any later "#" would count.
+    pieces = [None, None, None, "\n", "\n\n", "\n\n\n", "  ", " \n", "\n \n", "- ", "1. ", "> "]
+    out = []
+    for _ in range(rng.randint(1, 80)):
+        piece = rng.choice(pieces)
+        out.append(span(rng) + " " if piece is None else piece)
+    return "".join(out)
+
+
+INPUT_CLASSES: dict[str, Callable[[random.Random], str]] = {
+    "random": random_document,
+    "grammar": grammar_document,
+    "inline": inline_document,
+    "lists": list_document,
+}
+
+
+def image_html(src: str, alt: str) -> str:
+    return f'<img src="{src}" alt="{alt.replace(chr(34), "&quot;")}" loading="lazy" decoding="async">'
+
+
+def normalize_reference(html: str) -> str:
+    return REFERENCE_IMG.sub(lambda match: image_html(match.group(1), match.group(2)), html)
+
+
+def reference_html(markdown: str) -> str:
+    return normalize_reference(reference.markdown_to_html(markdown))
+
+
+def embed(rng: random.Random, piece: str, html: str, inline_piece: bool=True, trailing: bool=True) -> tuple[str, str]:
+    # The piece lands in a paragraph (or as its own block) among ordinary
+    # generated blocks. The reference renders the document with a
+    # placeholder word in its place, which is then swapped for the HTML the
+    # optimized parser is specified to produce for the piece.
+    if inline_piece:
+        parts = [inline(rng, rng.randint(0, 3)), PLACEHOLDER, inline(rng, rng.randint(0, 3)) if trailing else ""]
+        target = " ".join(part for part in parts if part)
+        replaced = PLACEHOLDER
+    else:
+        target = PLACEHOLDER
+        replaced = f"<p>{PLACEHOLDER}</p>"
+    blocks = [block(rng) for _ in range(rng.randint(0, 4))]
+    blocks.insert(rng.randint(0, len(blocks)), target)
+    document = "\n\n".join(blocks)
+    return document.replace(PLACEHOLDER, piece), reference_html(document).replace(replaced, html)
+
+
+def unmatched_document(rng: random.Random) -> tuple[str, str]:
+    # A delimiter with no closer stays literal; the reference toggles on it.
+    # Nothing that could close it may follow in the same paragraph.
+    piece = rng.choice(("`", "*", "**")) + words(rng)
+    return embed(rng, piece, piece, trailing=False)
+
+
+def fence_gap_document(rng: random.Random) -> tuple[str, str]:
+    # A blank line ends the block, so each half is a paragraph and their
+    # unmatched backticks stay literal.
+    first, second = words(rng), words(rng)
+    return embed(rng, f"```\n{first}\n\n{second}\n```", f"<p>```\n{first}</p><p>{second}\n```</p>", inline_piece=False)
+
+
+def heading_hash_document(rng: random.Random) -> tuple[str, str]:
+    # The level comes from the prefix alone; later "#" are heading text.
+    level = rng.randint(1, 6)
+    text = f"{words(rng)} {'#' * rng.randint(1, 3)} {words(rng)}"
+    return embed(rng, "#" * level + " " + text, f"<h{level}>{text}</h{level}>", inline_piece=False)
+
+
+def nested_document(rng: random.Random) -> tuple[str, str]:
+    # TextNodes are flat, so one level of nested emphasis becomes runs.
+    a, b, c = words(rng, 1, 3), words(rng, 1, 3), words(rng, 1, 3)
+    if rng.random() < 0.5:
+        return embed(rng, f"**{a} *{b}* {c}**", f"<b>{a} </b><i>{b}</i><b> {c}</b>")
+    return embed(rng, f"*{a} **{b}** {c}*", f"<i>{a} </i><b>{b}</b><i> {c}</i>")
+
+
+def span_label_document(rng: random.Random) -> tuple[str, str]:
+    # Link labels and image alt text are literal, markers and all.
+    label = rng.choice(("**{}**", "*{}*", "`{}`")).format(words(rng, 1, 3))
+    url = rng.choice(URLS)
+    if rng.random() < 0.5:
+        return embed(rng, f"[{label}]({url})", f'<a href="{url}">{label}</a>')
+    return embed(rng, f"![{label}]({url})", image_html(url, label))
+
+
+def bracket_document(rng: random.Random) -> tuple[str, str]:
+    # Labels and URLs stop at "[", so a link never swallows an earlier "[".
+    a, b, url = words(rng, 1, 3), words(rng, 1, 3), rng.choice(URLS)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return embed(rng, f"[{a} [{b}]({url})", f'[{a} <a href="{url}">{b}</a>')
+    if kind == 1:
+        return embed(rng, f"![{a} ![{b}]({url})", f"![{a} {image_html(url, b)}")
+    piece = f"[{a}]({url}[{b.replace(' ', '-')})"
+    return embed(rng, piece, piece, trailing=False)
+
+
+def adjacent_document(rng: random.Random) -> tuple[str, str]:
+    # The "**" after a closing "*" opens bold rather than closing italic twice.
+    a, b = words(rng, 1, 3), words(rng, 1, 3)
+    return embed(rng, f"*{a}***{b}**", f"<i>{a}</i><b>{b}</b>")
+
+
+DIVERGENT_CLASSES: dict[str, Callable[[random.Random], tuple[str, str]]] = {
+    "unmatched": unmatched_document,
+    "fencegap": fence_gap_document,
+    "heading#": heading_hash_document,
+    "nested": nested_document,
+    "labels": span_label_document,
+    "brackets": bracket_document,
+    "adjacent": adjacent_document,
+}
+
+
+def render_stream(markdown: str) -> str:
+    # The path generate_page takes: lines read from a file, rendered lazily.
+    node = ParentNode("div", render_blocks(iter_blocks(io.StringIO(markdown))))
+    return "".join(node.iter_html())
+
+
+def render_cached(markdown: str) -> str:
+    cache = BlockCache(path=None)
+    first = markdown_to_html_node(markdown, cache).to_html()
+    second = markdown_to_html_node(markdown, cache).to_html()
+    return first if first == second else f"cache hit differs from miss:\n{second}"
+
+
+MODES: dict[str, Callable[[str], str]] = {
+    "tree": lambda markdown: markdown_to_html_node(markdown).to_html(),
+    "stream": render_stream,
+    "cached": render_cached,
+}
+
+
+def check(markdown: str, expected: str=None) -> List[str]:
+    # Without an expected rendering the reference is the specification.
+    divergent = expected is not None
+    if not divergent:
+        expected = reference_html(markdown)
+    failures = [mode for mode, render in MODES.items() if render(markdown) != expected]
+    if not divergent and "\n" not in markdown and text_to_textnodes(markdown) != reference.text_to_textnodes(markdown):
+        failures.append("text_to_textnodes")
+    return failures
+
+
+def timed(render: Callable[[str], str], documents: List[str]) -> float:
+    start = time.perf_counter()
+    for markdown in documents:
+        render(markdown)
+    return time.perf_counter() - start
+
+
+def run(iterations: int=200, seed: int=0, classes: List[str]=None) -> dict[str, dict]:
+    results = {}
+    for name in classes or [*INPUT_CLASSES, *DIVERGENT_CLASSES]:
+        rng = random.Random(f"{seed}:{name}")
+        if name in INPUT_CLASSES:
+            cases = [(INPUT_CLASSES[name](rng), None) for _ in range(iterations)]
+        else:
+            cases = [DIVERGENT_CLASSES[name](rng) for _ in range(iterations)]
+        documents = [markdown for markdown, _ in cases]
+        mismatches = []
+        for markdown, expected in cases:
+            failures = check(markdown, expected)
+            if failures:
+                mismatches.append((failures, markdown))
+        reference_seconds = timed(reference.markdown_to_html, documents)
+        optimized_seconds = timed(MODES["tree"], documents)
+        results[name] = {
+            "inputs": len(documents),
+            "bytes": sum(len(markdown) for markdown in documents),
+            "mismatches": mismatches,
+            "speedup": reference_seconds / optimized_seconds if optimized_seconds else 0.0,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the optimized renderer with the frozen reference on generated markdown")
+    parser.add_argument("--iterations", type=int, default=500, help="documents generated per input class")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--class", dest="classes", action="append", choices=[*INPUT_CLASSES, *DIVERGENT_CLASSES], help="only run these input classes")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'class':<9} {'inputs':>7} {'bytes':>9} {'mismatches':>11} {'speedup':>8}")
+    for name, result in run(args.iterations, args.seed, args.classes).items():
+        print(f"{name:<9} {result['inputs']:>7} {result['bytes']:>9} {len(result['mismatches']):>11} {result['speedup']:>7.2f}x")
+        for failures, markdown in result["mismatches"][:3]:
+            failed = True
+            print(f"  {', '.join(failures)} differ on {markdown!r}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
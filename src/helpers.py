@@ -1,9 +1,20 @@
+import io
+import itertools
 import re
 import os
+import limits
+import profiling
+import siteindex
+import toc
 from enum import Enum
-from typing import List
+from typing import Iterable, Iterator, List
 from textnode import TextNode, TextType
+from toc import TableOfContents
 from htmlnode import HTMLNode, LeafNode, ParentNode
+from template import load_template
+from blockcache import BlockCache
+from discovery import DEFAULT_IGNORE, discover_pages
+from writer import OutputWriter
 
 class BlockType(Enum):
     HEADING = 1
@@ -14,65 +25,215 @@ class BlockType(Enum):
     CODE = 6
     QUOTE = 7
 
-def generate_pages_recursive(from_path: str, template_path: str, dest_path: str):
-    if os.path.isfile(from_path):
-        dest_path = os.path.splitext(dest_path)[0] + '.html'
-        generate_page(from_path, template_path, dest_path)
-    elif os.path.isdir(from_path):
-        if not os.path.exists(dest_path):
-            os.makedirs(dest_path)
-        for item in os.listdir(from_path):
-            item_path = os.path.join(from_path, item)
-            relative_item_path = os.path.relpath(item_path, from_path)
-            new_dest_path = os.path.join(dest_path, relative_item_path)
-            generate_pages_recursive(item_path, template_path, new_dest_path)
-
-def generate_page(from_path: str, template_path: str, dest_path: str):
-    with open(from_path, "r") as f:
-        markdown = f.read()
-    with open(template_path, "r") as f:
-        template = f.read()
-    heading = extract_title(markdown)
-    html = markdown_to_html_node(markdown)
-    with open(dest_path, "w") as f:
-        template = template.replace("{{ Title }}", heading)
-        template = template.replace("{{ Content }}", html.to_html())
-        f.write(template)
+def generate_pages_recursive(from_path: str, template_path: str, dest_path: str, ignore: Iterable[str]=DEFAULT_IGNORE):
+    made = set()
+    for src, dest in collect_pages(from_path, dest_path, ignore):
+        directory = os.path.dirname(dest)
+        if directory not in made:
+            os.makedirs(directory, exist_ok=True)
+            made.add(directory)
+        generate_page(src, template_path, dest)
+
+def collect_pages(from_path: str, dest_path: str, ignore: Iterable[str]=DEFAULT_IGNORE) -> List[tuple[str, str]]:
+    return discover_pages(from_path, dest_path, ignore)
+
+def generate_page(
+        from_path: str,
+        template_path: str,
+        dest_path: str,
+        metadata: dict[str, str]=None,
+        cache: BlockCache=None,
+        writer: OutputWriter=None
+        ):
+    template = load_template(template_path)
+    values = dict(metadata) if metadata is not None else {}
+    limits.active.start(from_path)
+    if "Toc" in template.slots:
+        toc.active = TableOfContents()
+    try:
+        with open(from_path, "r") as src:
+            first_line = src.readline()
+            if first_line.rstrip("\n") == FRONT_MATTER_FENCE:
+                # Front matter fills template slots such as {{ Author }}; it
+                # is read off the stream, so the body still renders in one pass.
+                values.update(read_front_matter(src))
+                first_line = src.readline()
+            values["Title"] = extract_title(first_line)
+            if siteindex.active is not None:
+                siteindex.active.title = values["Title"]
+            # Blocks are parsed and rendered one at a time while the page is
+            # written, so only the current block is ever held in memory.
+            blocks = iter_blocks(itertools.chain([first_line], src))
+            if profiling.active is not None:
+                blocks = profiling.active.timed("markdown_to_blocks", blocks)
+            values["Content"] = ParentNode(tag="div", children=render_blocks(blocks, cache))
+            if toc.active is not None:
+                # The TOC is complete only once every block has rendered. A
+                # {{ Toc }} after {{ Content }}, as in the default template,
+                # is filled in when the writer reaches it and the page still
+                # streams; a {{ Toc }} before it costs holding the rendered
+                # content in memory until the TOC can be written.
+                slots = template.slots
+                if "Content" in slots and slots.index("Content") < slots.index("Toc"):
+                    values["Toc"] = toc.active.deferred_node()
+                else:
+                    values["Content"] = values["Content"].to_html()
+                    values["Toc"] = toc.active.to_node()
+            if writer is not None:
+                buffer = io.StringIO()
+                with profiling.stage("to_html"):
+                    template.write(buffer, values)
+                writer.submit(dest_path, buffer.getvalue().encode())
+                return
+            # Outputs may be hardlinks to static assets or to merged shard
+            # trees, so the page goes to a new file renamed over the output;
+            # truncating it in place would rewrite the file it is linked to.
+            tmp_path = dest_path + ".tmp"
+            try:
+                with open(tmp_path, "w") as dest, profiling.stage("to_html"):
+                    template.write(dest, values)
+                os.replace(tmp_path, dest_path)
+            finally:
+                if os.path.lexists(tmp_path):
+                    os.remove(tmp_path)
+    finally:
+        limits.active.finish()
+        toc.active = None
 
 def block_to_block_type(block: str) -> BlockType:
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
-        return BlockType.HEADING
-    elif block.startswith("```") and block.endswith("```"):
-        return BlockType.CODE
-    elif all(line.startswith("> ") for line in block.split("\n")):
-        return BlockType.QUOTE
-    elif all(line.startswith("* ") for line in block.split("\n")):
-        return BlockType.UNORDERED_LIST
-    elif all(line.startswith("- ") for line in block.split("\n")):
-        return BlockType.UNORDERED_LIST
-    elif all(line.startswith(f"{i}. ") for i, line in enumerate(block.split("\n"), 1)):
-        return BlockType.ORDERED_LIST
-    else:
-        return BlockType.PARAGRAPH
-
-def markdown_to_blocks(markdown: str) -> List[TextNode]:
-    blocks = markdown.split("\n\n")
-    res = []
-    for block in blocks:
-        block = block.strip()
-        if block == "":
-            continue
-        res.append(block)
-    return res
+    return classify_block(block.split("\n"))[0]
+
+LINE_PREFIXES = (("> ", BlockType.QUOTE), ("* ", BlockType.UNORDERED_LIST), ("- ", BlockType.UNORDERED_LIST))
+
+def classify_block(lines: List[str]) -> tuple[BlockType, int]:
+    # The first line alone decides which type is possible, so the remaining
+    # lines are scanned at most once, against that single candidate.
+    first = lines[0]
+    level = heading_level(first)
+    if level:
+        return BlockType.HEADING, level
+    if first.startswith("```") and lines[-1].endswith("```"):
+        return BlockType.CODE, 0
+    for prefix, block_type in LINE_PREFIXES:
+        if first.startswith(prefix):
+            if all(line.startswith(prefix) for line in lines):
+                return block_type, 0
+            return BlockType.PARAGRAPH, 0
+    if first.startswith("1. ") and all(line.startswith(f"{i}. ") for i, line in enumerate(lines, 1)):
+        return BlockType.ORDERED_LIST, 0
+    return BlockType.PARAGRAPH, 0
+
+def heading_level(line: str) -> int:
+    level = 0
+    while level < 7 and line[level:level + 1] == "#":
+        level += 1
+    if 1 <= level <= 6 and line[level:level + 1] == " ":
+        return level
+    return 0
+
+def markdown_to_blocks(markdown: str) -> List[str]:
+    return ["\n".join(lines) for lines in iter_block_lines(markdown.split("\n"))]
+
+def iter_block_lines(lines: Iterable[str]) -> Iterator[List[str]]:
+    # Equivalent to splitting the text on "\n\n" and stripping each block,
+    # but consumes one line at a time.
+    block = []
+    for line in lines:
+        line = line.rstrip("\n")
+        if line == "":
+            yield from finish_block(block)
+            block = []
+        else:
+            block.append(line)
+    yield from finish_block(block)
+
+def finish_block(block: List[str]) -> Iterator[List[str]]:
+    start = 0
+    end = len(block)
+    while start < end and block[start].strip() == "":
+        start += 1
+    while end > start and block[end - 1].strip() == "":
+        end -= 1
+    if start == end:
+        return
+    block = block[start:end]
+    block[0] = block[0].lstrip()
+    block[-1] = block[-1].rstrip()
+    yield block
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[tuple[BlockType, List[str]]]:
+    for block in iter_block_lines(lines):
+        yield classify_block(block)[0], block
+
+# Labels and URLs stop at the next "[" as well as at their closing bracket.
+# A failed match therefore never scans past the next place another match
+# could start, so every character is examined a bounded number of times and
+# inline parsing is linear even for text full of unmatched "[" or "](".
+IMAGE_PATTERN = re.compile(r'!\[([^\[\]]+)\]\(([^\[)]+)\)')
+LINK_PATTERN = re.compile(r'\[([^\[\]]+)\]\(([^\[)]+)\)')
+# Alternatives are tried left to right at each position, so a code span
+# claims its text before any emphasis, image or link inside it is seen.
+# Bold may contain single "*" and italic may contain whole "**...**" runs,
+# so emphasis nests one level. Each alternative still stops at the first
+# delimiter it cannot take as part of its body, and that delimiter is a
+# valid closer, so a failed attempt implies none lie ahead and the whole
+# tokenizer stays O(n) in the length of the text.
+INLINE_PATTERN = re.compile(
+    r'`(?P<code>[^`]+)`'
+    r'|\*\*(?P<bold>(?:[^*]|\*(?!\*))+)\*\*'
+    r'|\*(?P<italic>(?:[^*]|\*\*[^*]+\*\*)+)\*'
+    r'|!\[(?P<alt>[^\[\]]+)\]\((?P<src>[^\[)]+)\)'
+    r'|\[(?P<label>[^\[\]]+)\]\((?P<href>[^\[)]+)\)'
+)
 
 def text_to_textnodes(text: str) -> List[TextNode]:
-    nodes = split_nodes_delimiter([TextNode(text, TextType.TEXT)], "`", TextType.CODE)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    if profiling.active is not None:
+        with profiling.active.stage("text_to_textnodes"):
+            nodes = tokenize_inline(text)
+        profiling.active.count("textnodes", len(nodes))
+    else:
+        nodes = tokenize_inline(text)
+    if siteindex.active is not None:
+        siteindex.record_nodes(nodes)
     return nodes
 
+def tokenize_inline(text: str) -> List[TextNode]:
+    nodes = []
+    last_index = 0
+    for match in INLINE_PATTERN.finditer(text):
+        start = match.start()
+        if start > last_index:
+            nodes.append(TextNode(text[last_index:start], TextType.TEXT))
+        kind = match.lastgroup
+        if kind == "code":
+            nodes.append(TextNode(match.group("code"), TextType.CODE))
+        elif kind == "bold":
+            append_emphasis(nodes, match.group("bold"), TextType.BOLD, "*", TextType.ITALIC)
+        elif kind == "italic":
+            append_emphasis(nodes, match.group("italic"), TextType.ITALIC, "**", TextType.BOLD)
+        elif kind == "src":
+            nodes.append(TextNode(match.group("alt"), TextType.IMAGE, match.group("src")))
+        else:
+            nodes.append(TextNode(match.group("label"), TextType.LINK, match.group("href")))
+        last_index = match.end()
+    if last_index < len(text):
+        nodes.append(TextNode(text[last_index:], TextType.TEXT))
+    return nodes
+
+def append_emphasis(nodes: List[TextNode], body: str, text_type: TextType, inner: str, inner_type: TextType):
+    # TextNodes are flat, so emphasis nested in emphasis becomes alternating
+    # runs: "**a *b* c**" is bold "a ", italic "b", bold " c".
+    if inner not in body:
+        nodes.append(TextNode(body, text_type))
+        return
+    parts = body.split(inner)
+    if len(parts) % 2 == 0:
+        # An unpaired inner delimiter stays literal text of the last run.
+        parts[-2:] = [parts[-2] + inner + parts[-1]]
+    for i, part in enumerate(parts):
+        if part:
+            nodes.append(TextNode(part, inner_type if i % 2 else text_type))
+
 def split_nodes_delimiter(
         nodes: List[TextNode],
         delimiter: str,
@@ -90,7 +251,6 @@ def split_nodes_delimiter(
     return result
 
 def split_nodes_image(nodes: List[TextNode]) -> List[TextNode]:
-    image_pattern = re.compile(r'!\[([^\]]+)\]\(([^)]+)\)')
     new_nodes = []
 
     for node in nodes:
@@ -101,7 +261,7 @@ def split_nodes_image(nodes: List[TextNode]) -> List[TextNode]:
         text = node.text
         last_index = 0
 
-        for match in image_pattern.finditer(text):
+        for match in IMAGE_PATTERN.finditer(text):
             start, end = match.span()
             if start > last_index:
                 new_nodes.append(TextNode(text[last_index:start], TextType.TEXT))
@@ -115,7 +275,6 @@ def split_nodes_image(nodes: List[TextNode]) -> List[TextNode]:
     return new_nodes
 
 def split_nodes_link(nodes: List[TextNode]) -> List[TextNode]:
-    link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
     new_nodes = []
 
     for node in nodes:
@@ -126,7 +285,7 @@ def split_nodes_link(nodes: List[TextNode]) -> List[TextNode]:
         text = node.text
         last_index = 0
 
-        for match in link_pattern.finditer(text):
+        for match in LINK_PATTERN.finditer(text):
             start, end = match.span()
             if start > last_index:
                 new_nodes.append(TextNode(text[last_index:start], TextType.TEXT))
@@ -139,10 +298,24 @@ def split_nodes_link(nodes: List[TextNode]) -> List[TextNode]:
 
     return new_nodes
 
+FRONT_MATTER_FENCE = "---"
+
+def read_front_matter(lines: Iterable[str]) -> dict[str, str]:
+    # "Name: value" lines up to a closing "---"; the opening fence has
+    # already been consumed. Lines without a colon are ignored.
+    values = {}
+    for line in lines:
+        line = line.rstrip("\n")
+        if line == FRONT_MATTER_FENCE:
+            return values
+        name, sep, value = line.partition(":")
+        if sep and name.strip():
+            values[name.strip()] = value.strip()
+    raise ValueError("Front matter is not closed with ---")
+
 def extract_title(markdown: str) -> str:
     if markdown.startswith("# "):
-        # Find the first newline
-        return markdown[2:markdown.index("\n")].strip()
+        return markdown.partition("\n")[0][2:].strip()
     else:
         raise ValueError("No title found")
 
@@ -154,27 +327,64 @@ def extract_markdown_links(text: str) -> List[tuple[str, str]]:
     pattern = r"\[([\w\s]+)\]\((https:\/\/[\w\.\/@]+)"
     return re.findall(pattern, text)
 
-def markdown_to_html_node(markdown: str) -> ParentNode:
-    blocks = markdown_to_blocks(markdown)
-    nodes = []
-    for block in blocks:
-        block_type = block_to_block_type(block)
-
-        if block_type == BlockType.HEADING:
-            level = block.count("#")
-            tag = f"h{level}"
-            nodes.append(ParentNode(tag=tag, children=text_to_textnodes(block[level + 1:].strip())))
-        elif block_type == BlockType.CODE:
-            nodes.append(ParentNode(tag="pre", children=[LeafNode(tag="code", value=block[3:-3])]))
-        elif block_type == BlockType.QUOTE:
-            nodes.append(ParentNode(tag="blockquote", children=text_to_textnodes(block[2:].strip())))
-        elif block_type == BlockType.UNORDERED_LIST:
-            children = [ParentNode(tag="li", children=text_to_textnodes(line[2:].strip())) for line in block.split("\n")]
-            nodes.append(ParentNode(tag="ul", children=children))
-        elif block_type == BlockType.ORDERED_LIST:
-            children = [ParentNode(tag="li", children=text_to_textnodes(line.split(". ")[1].strip())) for line in block.split("\n")]
-            nodes.append(ParentNode(tag="ol", children=children))
-        else:
-            nodes.append(ParentNode(tag="p", children=text_to_textnodes(block)))
-    root = ParentNode(tag="div", children=nodes)
-    return root
\ No newline at end of file
+def markdown_to_html_node(markdown: str, cache: BlockCache=None) -> ParentNode:
+    nodes = list(render_blocks(iter_blocks(markdown.split("\n")), cache))
+    return ParentNode(tag="div", children=nodes)
+
+def render_blocks(blocks: Iterable[tuple[BlockType, List[str]]], cache: BlockCache=None) -> Iterator[HTMLNode]:
+    profiler = profiling.active
+    budget = limits.active
+    for block_type, lines in blocks:
+        budget.check()
+        if profiler is None:
+            yield render_block(block_type, lines, cache)
+            continue
+        profiler.count("blocks")
+        with profiler.stage("block_to_html_node"):
+            node = render_block(block_type, lines, cache)
+        yield node
+
+def render_block(block_type: BlockType, lines: List[str], cache: BlockCache=None) -> HTMLNode:
+    # A heading's id depends on the headings before it on the page, so it
+    # cannot be reused from another page while a TOC is being collected.
+    if cache is None or (block_type == BlockType.HEADING and toc.active is not None):
+        return block_to_html_node(block_type, lines)
+    key = cache.key(lines)
+    entry = cache.get(key)
+    if entry is None:
+        # Links and images are stored with the fragment so the site index
+        # stays complete for blocks that are never re-parsed.
+        page_record = siteindex.active
+        siteindex.active = siteindex.PageRecord()
+        try:
+            html = block_to_html_node(block_type, lines).to_html()
+            entry = [html, siteindex.active.links, siteindex.active.images]
+        finally:
+            siteindex.active = page_record
+        cache.put(key, entry)
+    if siteindex.active is not None:
+        siteindex.active.extend(entry[1], entry[2])
+    # An untagged leaf emits its value verbatim, splicing the cached fragment in.
+    return LeafNode(tag=None, value=entry[0])
+
+def block_to_html_node(block_type: BlockType, lines: List[str]) -> ParentNode:
+    if block_type == BlockType.UNORDERED_LIST:
+        children = [ParentNode(tag="li", children=text_to_textnodes(line[2:].strip())) for line in lines]
+        return ParentNode(tag="ul", children=children)
+    elif block_type == BlockType.ORDERED_LIST:
+        children = [ParentNode(tag="li", children=text_to_textnodes(line.split(". ")[1].strip())) for line in lines]
+        return ParentNode(tag="ol", children=children)
+
+    block = "\n".join(lines)
+    if block_type == BlockType.HEADING:
+        level = heading_level(lines[0])
+        children = text_to_textnodes(block[level + 1:].strip())
+        if toc.active is not None:
+            return toc.active.heading(level, children)
+        return ParentNode(tag=f"h{level}", children=children)
+    elif block_type == BlockType.CODE:
+        return ParentNode(tag="pre", children=[LeafNode(tag="code", value=block[3:-3])])
+    elif block_type == BlockType.QUOTE:
+        return ParentNode(tag="blockquote", children=text_to_textnodes(block[2:].strip()))
+    else:
+        return ParentNode(tag="p", children=text_to_textnodes(block))
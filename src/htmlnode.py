@@ -1,6 +1,8 @@
-from typing import List
+from typing import Iterator, List, TextIO
 
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(
             self,
             tag: str=None,
@@ -16,6 +18,12 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError()
 
+    def iter_html(self) -> Iterator[str]:
+        yield self.to_html()
+
+    def write_html(self, out: TextIO):
+        out.writelines(self.iter_html())
+
     def props_to_html(self):
         if self.props is None:
             return ""
@@ -26,6 +34,8 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(
             self,
             tag: str,
@@ -34,7 +44,12 @@ class LeafNode(HTMLNode):
             ):
         if value is None:
             raise ValueError("LeafNode must have a value")
-        super().__init__(tag, value, None, props)
+        # Assigned here rather than through HTMLNode.__init__: a leaf is
+        # built for every cached block and, with a TOC, every heading.
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
 
     def to_html(self):
         if self.tag is None:
@@ -45,8 +60,29 @@ class LeafNode(HTMLNode):
             props = ""
         return f"<{self.tag}{props}>{self.value}</{self.tag}>"
 
+    def iter_html(self) -> Iterator[str]:
+        # Untagged leaves carry pre-rendered HTML and are emitted as is.
+        yield self.value if self.tag is None else self.to_html()
+
+
+class VoidNode(HTMLNode):
+    __slots__ = ()
+
+    # Elements such as <img> that take attributes but no content or end tag.
+    def __init__(self, tag: str, props: dict[str, str]=None):
+        if tag is None:
+            raise ValueError("VoidNode must have a tag")
+        super().__init__(tag, None, None, props)
+
+    def to_html(self):
+        if self.props is not None and len(self.props) > 0:
+            return f"<{self.tag} {self.props_to_html()}>"
+        return f"<{self.tag}>"
+
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(
             self,
             tag: str,
@@ -58,11 +94,18 @@ class ParentNode(HTMLNode):
         super().__init__(tag, None, children, props)
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self) -> Iterator[str]:
+        # Fragments are yielded as they are produced, so nothing above the
+        # leaves is ever materialised and memory grows with depth, not size.
         if self.tag is None:
             raise ValueError("ParentNode must have a tag")
         if self.props is not None and len(self.props) > 0:
             props = " " + self.props_to_html()
         else:
             props = ""
-        children = "".join([child.to_html() for child in self.children])
-        return f"<{self.tag}{props}>{children}</{self.tag}>"
+        yield f"<{self.tag}{props}>"
+        for child in self.children:
+            yield from child.iter_html()
+        yield f"</{self.tag}>"
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import struct
+from typing import BinaryIO, List
+from manifest import load_json, save_json, stat_unchanged
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+# Enough for the PNG, GIF and WebP headers; JPEG seeks from marker to marker.
+HEADER_BYTES = 32
+# SOF markers carry the frame size; C4 (DHT), C8 (JPG) and CC (DAC) do not.
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Maps site URLs of static images ("/images/a.png") to (width, height)
+# while a build is rendering, so <img> elements reserve their layout box.
+active: dict[str, tuple[int, int]] | None = None
+
+
+def read_dimensions(path: str) -> tuple[int, int] | None:
+    # Only the header is read; a multi-MB image costs one or two small reads.
+    try:
+        with open(path, "rb") as f:
+            head = f.read(HEADER_BYTES)
+            if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+                return struct.unpack(">II", head[16:24])
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return struct.unpack("<HH", head[6:10])
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                return webp_dimensions(head)
+            if head[:2] == b"\xff\xd8":
+                return jpeg_dimensions(f)
+    except (OSError, struct.error):
+        return None
+    return None
+
+
+def webp_dimensions(head: bytes) -> tuple[int, int] | None:
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and head[20:21] == b"\x2f":
+        bits = struct.unpack("<I", head[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(head) >= 30:
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+
+def jpeg_dimensions(f: BinaryIO) -> tuple[int, int] | None:
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        while code == 0xFF:
+            # Markers may be padded with any number of fill bytes.
+            fill = f.read(1)
+            if not fill:
+                return None
+            code = fill[0]
+        if code == 0x01 or 0xD0 <= code <= 0xD8:
+            continue
+        if code == 0xD9 or code == 0xDA:
+            return None
+        length = struct.unpack(">H", f.read(2))[0]
+        if code in JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">xHH", f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+class ImageSizeCache:
+    def __init__(self, entries: dict[str, list]=None):
+        # Each entry is [size, mtime_ns, width, height]; width and height are
+        # None for files whose header could not be read.
+        self.entries = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, path: str) -> 'ImageSizeCache':
+        return cls(load_json(path))
+
+    def save(self, path: str):
+        save_json(path, self.entries, indent=1, sort_keys=True)
+
+    def dimensions(self, path: str) -> tuple[int, int] | None:
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry is None or not stat_unchanged(stat, entry[0], entry[1]):
+            entry = [stat.st_size, stat.st_mtime_ns, *(read_dimensions(path) or (None, None))]
+            self.entries[path] = entry
+        return None if entry[2] is None else (entry[2], entry[3])
+
+    def retain(self, paths: set[str]):
+        self.entries = {path: entry for path, entry in self.entries.items() if path in paths}
+
+    def __repr__(self):
+        return f"ImageSizeCache({len(self.entries)} images)"
+
+
+def sizes_path_for(manifest_path: str) -> str:
+    return os.path.join(os.path.dirname(manifest_path), "image-sizes.json")
+
+
+def is_image(path: str) -> bool:
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def image_url(dest: str, dest_path: str) -> str:
+    return "/" + os.path.relpath(dest, dest_path).replace(os.sep, "/")
+
+
+def measure_static(
+        static_files: List[tuple[str, str]],
+        dest_path: str,
+        cache: 'ImageSizeCache'
+        ) -> dict[str, tuple[int, int]]:
+    sizes = {}
+    for src, dest in static_files:
+        if is_image(src):
+            dimensions = cache.dimensions(src)
+            if dimensions is not None:
+                sizes[image_url(dest, dest_path)] = dimensions
+    cache.retain({src for src, _ in static_files if is_image(src)})
+    return sizes
+
+
+def sizes_digest(sizes: dict[str, tuple[int, int]]) -> str:
+    return hashlib.sha256(json.dumps(sizes, sort_keys=True).encode()).hexdigest()
+
+
+def lookup(url: str) -> tuple[int, int] | None:
+    if active is None:
+        return None
+    return active.get(url)
@@ -0,0 +1,49 @@
+import os
+import time
+
+# Rendering is linear in the size of a page (see INLINE_PATTERN in helpers),
+# so a size cap bounds the work per page and the deadline only has to catch
+# pathological hosts, not pathological markdown. Both are off by default:
+# real sites have multi-MB pages (changelogs, API references) that must build.
+MAX_PAGE_BYTES: int | None = None
+MAX_PAGE_SECONDS: float | None = None
+
+
+class BudgetExceeded(ValueError):
+    pass
+
+
+class PageBudget:
+    __slots__ = ("max_bytes", "max_seconds", "path", "deadline")
+
+    def __init__(self, max_bytes: int | None=MAX_PAGE_BYTES, max_seconds: float | None=MAX_PAGE_SECONDS):
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.path: str = None
+        self.deadline: float = None
+
+    def start(self, path: str):
+        if self.max_bytes is not None:
+            size = os.path.getsize(path)
+            if size > self.max_bytes:
+                raise BudgetExceeded(f"{path} is {size} bytes, over the {self.max_bytes} byte page budget")
+        self.path = path
+        if self.max_seconds is not None:
+            self.deadline = time.perf_counter() + self.max_seconds
+
+    def check(self):
+        # Called once per block: cheap enough to leave on, and a single block
+        # cannot run long because each block renders in linear time.
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExceeded(f"{self.path} took longer than the {self.max_seconds}s page budget")
+
+    def finish(self):
+        self.path = None
+        self.deadline = None
+
+    def __repr__(self):
+        return f"PageBudget({self.max_bytes} bytes, {self.max_seconds}s)"
+
+
+# Budget applied to every page generate_page renders; unlimited unless set.
+active = PageBudget()
@@ -0,0 +1,54 @@
+import posixpath
+from typing import Iterable, List
+from urllib.parse import unquote, urlsplit
+from siteindex import SiteIndex, output_url
+
+
+def live_urls(outputs: Iterable[str], dest_path: str) -> set[str]:
+    urls = set()
+    for output in outputs:
+        url = output_url(output, dest_path)
+        urls.add(url)
+        # A directory page answers to "/blog", "/blog/" and "/blog/index.html".
+        if url.endswith("/"):
+            urls.add(url + "index.html")
+            if url != "/":
+                urls.add(url[:-1])
+    return urls
+
+
+def resolve_url(url: str, page_url: str) -> str | None:
+    parts = urlsplit(url)
+    # External URLs, mailto: and data: links, and bare fragments are not ours to check.
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = unquote(parts.path)
+    if not path.startswith("/"):
+        path = posixpath.join(posixpath.dirname(page_url), path)
+    resolved = posixpath.normpath(path)
+    if path.endswith("/") and resolved != "/":
+        resolved += "/"
+    return resolved
+
+
+def check_links(index: SiteIndex, live: set[str], dest_path: str) -> List[tuple[str, str, str]]:
+    broken = []
+    for source, entry in sorted(index.pages.items()):
+        page_url = output_url(entry["output"], dest_path)
+        for kind in ("links", "images"):
+            for url in entry[kind]:
+                # Most references are already absolute site paths; only the
+                # rest pay for parsing and normalisation.
+                if url in live:
+                    continue
+                resolved = resolve_url(url, page_url)
+                if resolved is not None and resolved not in live:
+                    broken.append((source, kind[:-1], url))
+    return broken
+
+
+def format_broken_links(broken: List[tuple[str, str, str]]) -> str:
+    lines = [f"{len(broken)} broken internal references:"]
+    for source, kind, url in broken:
+        lines.append(f"  {source}: {kind} {url}")
+    return "\n".join(lines)
@@ -1,39 +1,121 @@
+import argparse
 import os
-import shutil
-from textnode import TextNode, TextType
-from helpers import generate_pages_recursive
+import sys
+import limits
+import profiling
+from blockcache import BlockCache, BLOCK_CACHE_PATH
+from build import build_site
+from discovery import DEFAULT_IGNORE
+from limits import PageBudget
+from manifest import MANIFEST_PATH
+from shard import SHARD_PLANS, merge_shards, parse_shard, shard_build_path, shard_name
+from siteindex import index_path_for
+from linkcheck import format_broken_links
+from parallel import format_worker_stats
+from server import serve
 
-def main():
-    copy_static_files_to_public_folder()
-    generate_pages_recursive(from_path="content", template_path="template.html", dest_path="public")
 
+def main():
+    parser = argparse.ArgumentParser(description="Build the static site into public/")
+    parser.add_argument("command", nargs="?", choices=["build", "serve", "merge"], default="build")
+    parser.add_argument("--incremental", action="store_true", help="only rebuild pages and assets that changed since the last build")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes used to render pages")
+    parser.add_argument("--writer-threads", type=int, default=0, help="write pages from a background pool, skipping byte-identical outputs")
+    parser.add_argument("--fingerprint", action="store_true", help="emit content-hashed copies of static assets and link to them")
+    parser.add_argument("--compress", action="store_true", help="write .gz (and .br with brotli installed) siblings for compressible outputs")
+    parser.add_argument("--block-cache", action="store_true", help="reuse rendered HTML for blocks whose source is unchanged (needs --workers 1)")
+    parser.add_argument("--profile", action="store_true", help="record per-stage and per-page timings")
+    parser.add_argument("--profile-output", default=os.path.join(".build", "profile.json"), help="where --profile writes its JSON/Chrome trace")
+    parser.add_argument("--ignore", action="append", default=[], metavar="GLOB", help="skip content matching GLOB, in addition to hidden, backup and _draft files")
+    parser.add_argument("--max-page-bytes", type=int, help="skip and report content pages larger than this (default: no limit)")
+    parser.add_argument("--max-page-seconds", type=float, help="skip and report pages that take longer than this to render (default: no limit)")
+    parser.add_argument("--shard", type=parse_shard, help="render only shard i of N (i/N) into public-shard-i-of-N")
+    parser.add_argument("--shard-plan", choices=SHARD_PLANS, default="hash", help="partition pages by path hash or balance them by size")
+    parser.add_argument("--shards", type=int, help="with merge: combine public-shard-*-of-N into public")
+    parser.add_argument("--watch", action="store_true", help="with serve: rebuild on change and live-reload open pages")
+    parser.add_argument("--port", type=int, default=8888, help="with serve: port to listen on")
+    args = parser.parse_args()
+    if args.block_cache and args.workers > 1:
+        parser.error("--block-cache needs --workers 1: the cache lives in the main process and pool workers render without it")
 
-def copy_static_files_to_public_folder():
-    if not os.path.exists("public"):
-        os.makedirs("public")
+    if args.command == "serve":
+        serve(
+            content_path="content",
+            static_path="static",
+            template_path="template.html",
+            dest_path="public",
+            port=args.port,
+            watch=args.watch,
+        )
+        return
 
-    if os.path.exists("public"):
-        for item in os.listdir("public"):
-            item_path = os.path.join("public", item)
-            if os.path.isfile(item_path):
-                os.remove(item_path)
-            elif os.path.isdir(item_path):
-                shutil.rmtree(item_path)
+    if args.command == "merge":
+        if not args.shards:
+            parser.error("merge needs --shards N")
+        shards = range(1, args.shards + 1)
+        try:
+            stats = merge_shards(
+                [shard_name("public", i, args.shards) for i in shards],
+                "public",
+                [index_path_for(shard_build_path(MANIFEST_PATH, i, args.shards)) for i in shards],
+                index_path_for(MANIFEST_PATH),
+            )
+        except ValueError as error:
+            sys.exit(f"Merge failed: {error}")
+        print(f"Merged {args.shards} shards: {stats['files']} files, {stats['merged']} updated, {stats['removed']} removed")
+        return
 
-    for root, dirs, files in os.walk("static"):
-        relative_root = os.path.relpath(root, "static")
-        for directory in dirs:
-            dest_dir = os.path.join("public", relative_root, directory)
-            if not os.path.exists(dest_dir):
-                os.makedirs(dest_dir)
+    dest_path = "public"
+    manifest_path = MANIFEST_PATH
+    cache_path = BLOCK_CACHE_PATH
+    if args.shard is not None:
+        # Shards write to their own directories so N of them can run side by
+        # side on one machine, or on N machines before the merge.
+        dest_path = shard_name(dest_path, *args.shard)
+        manifest_path = shard_build_path(manifest_path, *args.shard)
+        cache_path = shard_build_path(cache_path, *args.shard)
+    limits.active = PageBudget(args.max_page_bytes, args.max_page_seconds)
+    if args.profile:
+        profiling.active = profiling.Profiler()
+    cache = BlockCache(cache_path).load() if args.block_cache else None
+    stats = build_site(
+        content_path="content",
+        static_path="static",
+        template_path="template.html",
+        dest_path=dest_path,
+        incremental=args.incremental,
+        manifest_path=manifest_path,
+        workers=args.workers,
+        cache=cache,
+        writer_threads=args.writer_threads,
+        fingerprint_assets=args.fingerprint,
+        compress=args.compress,
+        shard=args.shard,
+        shard_plan=args.shard_plan,
+        ignore=[*DEFAULT_IGNORE, *args.ignore],
+    )
+    if cache is not None:
+        cache.save()
+        if cache.hits or cache.misses:
+            print(f"Block cache: {cache.hits} hits, {cache.misses} misses")
+    if args.writer_threads > 0:
+        print(f"Pages: {stats['pages_built'] - stats['pages_unchanged']} written, {stats['pages_unchanged']} unchanged")
+    if args.workers > 1:
+        print(format_worker_stats(stats["workers"]))
+    if args.compress:
+        print(f"Compressed {stats['compressed']} outputs")
+    if stats["broken_links"]:
+        print(format_broken_links(stats["broken_links"]), file=sys.stderr)
+    if args.profile:
+        profiling.active.write(args.profile_output)
+        print(profiling.active.summary())
+        print(f"Profile written to {args.profile_output}")
+    if stats["over_budget"]:
+        print(f"Skipped {len(stats['over_budget'])} page(s) over the page budget:", file=sys.stderr)
+        for message in stats["over_budget"].values():
+            print(f"  {message}", file=sys.stderr)
+        sys.exit(1)
 
-        for file in files:
-            src_path = os.path.join(root, file)
-            relative_root = os.path.relpath(root, "static")
-            dest_path = os.path.join("public", relative_root, file)
-            shutil.copy(src_path, dest_path)
-    
-    
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+
+MANIFEST_PATH = os.path.join(".build", "manifest.json")
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_unchanged(stat: os.stat_result, size: int, mtime_ns: int) -> bool:
+    # Records of static files keep their size and mtime, so a file whose
+    # stat still matches is trusted without being reread.
+    return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+
+def load_json(path: str, default=None):
+    # A missing or unreadable file is treated as absent; every caller can
+    # rebuild what it held.
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: str, data, **options):
+    # Written to a temp file and renamed into place, so an interrupted build
+    # never leaves a truncated file behind for the next one to load.
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, **options)
+    os.replace(tmp_path, path)
+
+
+class Manifest:
+    def __init__(
+            self,
+            template: str=None,
+            pages: dict[str, dict[str, str]]=None,
+            static: dict[str, dict[str, str]]=None,
+            assets: str=None,
+            compressed: dict[str, dict]=None,
+            images: str=None
+            ):
+        self.template = template
+        self.pages = pages if pages is not None else {}
+        self.static = static if static is not None else {}
+        self.assets = assets
+        self.compressed = compressed if compressed is not None else {}
+        self.images = images
+
+    @classmethod
+    def load(cls, path: str=MANIFEST_PATH) -> 'Manifest':
+        data = load_json(path, {})
+        return cls(data.get("template"), data.get("pages"), data.get("static"), data.get("assets"), data.get("compressed"), data.get("images"))
+
+    def save(self, path: str=MANIFEST_PATH):
+        data = {"template": self.template, "pages": self.pages, "static": self.static, "assets": self.assets, "compressed": self.compressed, "images": self.images}
+        save_json(path, data, indent=1, sort_keys=True)
+
+    def __repr__(self):
+        return f"Manifest({self.template}, {len(self.pages)} pages, {len(self.static)} static)"
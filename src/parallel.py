@@ -0,0 +1,139 @@
+import os
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+from blockcache import BlockCache
+from helpers import collect_pages, generate_page
+from writer import OutputWriter
+from limits import BudgetExceeded, PageBudget
+import fingerprint
+import imagesize
+import limits
+import profiling
+import siteindex
+from siteindex import SiteIndex
+
+
+def generate_pages_parallel(
+        from_path: str,
+        template_path: str,
+        dest_path: str,
+        workers: int=None,
+        chunk_size: int=None,
+        writer_threads: int=0
+        ) -> dict[int, dict[str, float]]:
+    return render_pages(collect_pages(from_path, dest_path), template_path, workers, chunk_size, writer_threads=writer_threads)
+
+
+def render_pages(
+        pages: List[tuple[str, str]],
+        template_path: str,
+        workers: int=None,
+        chunk_size: int=None,
+        cache: BlockCache=None,
+        writer_threads: int=0,
+        index: SiteIndex=None,
+        over_budget: dict[str, str]=None
+        ) -> dict[int, dict[str, float]]:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    for directory in {os.path.dirname(dest) for _, dest in pages}:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # The block cache lives in this process; pool workers render without it.
+    if workers <= 1 or len(pages) <= 1:
+        return merge_worker_stats([render_batch(template_path, pages, cache, writer_threads=writer_threads)], index, over_budget)
+
+    if chunk_size is None:
+        # A few batches per worker keeps the pool busy when page sizes vary.
+        chunk_size = max(1, len(pages) // (workers * 4))
+    batches = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+    profile = profiling.active is not None
+    task = partial(render_batch, template_path, profile=profile, writer_threads=writer_threads, asset_urls=fingerprint.active, image_sizes=imagesize.active, budget=limits.active)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(task, batches))
+    if profile:
+        for result in results:
+            profiling.active.merge(result["profile"])
+    return merge_worker_stats(results, index, over_budget)
+
+
+def render_batch(
+        template_path: str,
+        pages: List[tuple[str, str]],
+        cache: BlockCache=None,
+        profile: bool=False,
+        writer_threads: int=0,
+        asset_urls: dict[str, str]=None,
+        image_sizes: dict[str, tuple[int, int]]=None,
+        budget: PageBudget=None
+        ) -> dict:
+    if profile:
+        # A forked worker inherits the parent's profiler; start from a clean one.
+        profiling.active = profiling.Profiler()
+    if asset_urls is not None:
+        fingerprint.active = asset_urls
+    if image_sizes is not None:
+        imagesize.active = image_sizes
+    if budget is not None:
+        limits.active = budget
+    start = time.perf_counter()
+    total_bytes = 0
+    records = {}
+    # Pages over the budget are reported rather than failing the whole batch.
+    failed = {}
+    writer = OutputWriter(writer_threads) if writer_threads > 0 else None
+    try:
+        for src, dest in pages:
+            siteindex.active = siteindex.PageRecord()
+            try:
+                with profiling.page(src):
+                    generate_page(src, template_path, dest, cache=cache, writer=writer)
+            except BudgetExceeded as e:
+                failed[src] = str(e)
+                continue
+            size = os.path.getsize(src)
+            total_bytes += size
+            records[src] = siteindex.active.entry(dest, size)
+    finally:
+        siteindex.active = None
+        if writer is not None:
+            writer.close()
+    return {
+        "pid": os.getpid(),
+        "pages": len(pages),
+        "bytes": total_bytes,
+        "seconds": time.perf_counter() - start,
+        "written": writer.written if writer is not None else len(pages) - len(failed),
+        "unchanged": writer.unchanged if writer is not None else 0,
+        "profile": profiling.active.to_dict() if profile else None,
+        "records": records,
+        "over_budget": failed,
+    }
+
+
+def merge_worker_stats(results: List[dict], index: SiteIndex=None, over_budget: dict[str, str]=None) -> dict[int, dict[str, float]]:
+    workers = {}
+    for result in results:
+        if index is not None:
+            for src, record in result["records"].items():
+                index.update(src, record)
+        if over_budget is not None:
+            over_budget.update(result["over_budget"])
+        stats = workers.setdefault(result["pid"], {"pages": 0, "bytes": 0, "seconds": 0.0, "written": 0, "unchanged": 0})
+        for key in stats:
+            stats[key] += result[key]
+    return workers
+
+
+def format_worker_stats(workers: dict[int, dict[str, float]]) -> str:
+    lines = [f"{'worker':>8} {'pages':>8} {'seconds':>9} {'pages/s':>9} {'MB/s':>8}"]
+    for pid, stats in sorted(workers.items()):
+        seconds = stats["seconds"] or 1e-9
+        lines.append(
+            f"{pid:>8} {stats['pages']:>8} {stats['seconds']:>9.3f} "
+            f"{stats['pages'] / seconds:>9.1f} {stats['bytes'] / seconds / 1e6:>8.2f}"
+        )
+    return "\n".join(lines)
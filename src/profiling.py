@@ -0,0 +1,122 @@
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Iterable, Iterator, List
+
+
+class Profiler:
+    def __init__(self):
+        self.stages: dict[str, dict[str, float]] = {}
+        self.counters: dict[str, int] = {}
+        self.pages: List[dict] = []
+        self.events: List[dict] = []
+        # Time spent in nested stages, so each stage also reports self time.
+        self.stack: List[list[float]] = []
+
+    @contextmanager
+    def stage(self, name: str, trace: bool=False, args: dict=None):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        children = [0.0, 0.0]
+        self.stack.append(children)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            stats = self.stages.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "self_wall": 0.0, "self_cpu": 0.0})
+            stats["calls"] += 1
+            stats["wall"] += wall
+            stats["cpu"] += cpu
+            stats["self_wall"] += wall - children[0]
+            stats["self_cpu"] += cpu - children[1]
+            if self.stack:
+                self.stack[-1][0] += wall
+                self.stack[-1][1] += cpu
+            if trace:
+                # perf_counter is monotonic system-wide, so traces from pool
+                # workers line up with the parent's on one timeline.
+                self.events.append({
+                    "name": name, "ph": "X", "pid": os.getpid(), "tid": 0,
+                    "ts": wall_start * 1e6, "dur": wall * 1e6, "args": args or {},
+                })
+
+    @contextmanager
+    def page(self, path: str):
+        before = dict(self.counters)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        with self.stage("page", trace=True, args={"path": path}):
+            yield
+        record = {"path": path, "wall": time.perf_counter() - wall_start, "cpu": time.process_time() - cpu_start}
+        for name, value in self.counters.items():
+            record[name] = value - before.get(name, 0)
+        self.pages.append(record)
+
+    def count(self, name: str, n: int=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed(self, name: str, iterator: Iterable) -> Iterator:
+        iterator = iter(iterator)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def to_dict(self) -> dict:
+        return {"stages": self.stages, "counters": self.counters, "pages": self.pages, "traceEvents": self.events}
+
+    def merge(self, data: dict):
+        for name, other in data["stages"].items():
+            stats = self.stages.setdefault(name, {key: 0 for key in other})
+            for key, value in other.items():
+                stats[key] += value
+        for name, value in data["counters"].items():
+            self.count(name, value)
+        self.pages.extend(data["pages"])
+        self.events.extend(data["traceEvents"])
+
+    def write(self, path: str):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    def summary(self, slowest: int=10) -> str:
+        lines = [f"{'stage':<20} {'calls':>9} {'wall s':>9} {'cpu s':>9} {'self wall':>10} {'self cpu':>9}"]
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1]["self_wall"]):
+            lines.append(
+                f"{name:<20} {stats['calls']:>9} {stats['wall']:>9.3f} {stats['cpu']:>9.3f} "
+                f"{stats['self_wall']:>10.3f} {stats['self_cpu']:>9.3f}"
+            )
+        if self.counters:
+            lines.append("")
+            lines.extend(f"{name:<20} {value:>9}" for name, value in sorted(self.counters.items()))
+        if self.pages:
+            lines.append("")
+            lines.append(f"{'slowest pages':<40} {'wall s':>9} {'cpu s':>9} {'blocks':>8}")
+            for page in sorted(self.pages, key=lambda page: -page["wall"])[:slowest]:
+                lines.append(f"{page['path']:<40} {page['wall']:>9.3f} {page['cpu']:>9.3f} {page.get('blocks', 0):>8}")
+        return "\n".join(lines)
+
+
+# Set to a Profiler to record; instrumentation is a no-op while this is None.
+active: Profiler | None = None
+
+
+def stage(name: str, trace: bool=False, args: dict=None):
+    if active is None:
+        return nullcontext()
+    return active.stage(name, trace, args)
+
+
+def page(path: str):
+    if active is None:
+        return nullcontext()
+    return active.page(path)
@@ -0,0 +1,144 @@
+import re
+from typing import List
+from textnode import TextNode, TextType
+
+# Frozen copy of the original, straightforward markdown pipeline. The fuzz
+# harness renders the same input here and through helpers and requires
+# byte-identical HTML, so optimized paths can be checked against it.
+# Do not optimize or "fix" this module; it is the specification.
+
+
+class Leaf:
+    def __init__(self, tag: str, value: str, props: dict[str, str]=None):
+        self.tag = tag
+        self.value = value
+        self.props = props
+
+    def to_html(self):
+        if self.tag is None:
+            return self.value
+        if self.props is not None and len(self.props) > 0:
+            props = " " + " ".join([f'{key}="{value}"' for key, value in self.props.items()])
+        else:
+            props = ""
+        return f"<{self.tag}{props}>{self.value}</{self.tag}>"
+
+
+class Parent:
+    def __init__(self, tag: str, children: list):
+        self.tag = tag
+        self.children = children
+
+    def to_html(self):
+        children = "".join([child.to_html() for child in self.children])
+        return f"<{self.tag}>{children}</{self.tag}>"
+
+
+def text_node_to_leaf(text_node: TextNode) -> Leaf:
+    match text_node.text_type:
+        case TextType.TEXT:
+            return Leaf(None, text_node.text)
+        case TextType.BOLD:
+            return Leaf("b", text_node.text)
+        case TextType.ITALIC:
+            return Leaf("i", text_node.text)
+        case TextType.CODE:
+            return Leaf("code", text_node.text)
+        case TextType.LINK:
+            return Leaf("a", text_node.text, {"href": text_node.url})
+        case TextType.IMAGE:
+            return Leaf("img", text_node.text, {"src": text_node.url})
+
+
+def block_to_block_type(block: str) -> str:
+    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
+        return "heading"
+    elif block.startswith("```") and block.endswith("```"):
+        return "code"
+    elif all(line.startswith("> ") for line in block.split("\n")):
+        return "quote"
+    elif all(line.startswith("* ") for line in block.split("\n")):
+        return "unordered_list"
+    elif all(line.startswith("- ") for line in block.split("\n")):
+        return "unordered_list"
+    elif all(line.startswith(f"{i}. ") for i, line in enumerate(block.split("\n"), 1)):
+        return "ordered_list"
+    else:
+        return "paragraph"
+
+
+def markdown_to_blocks(markdown: str) -> List[str]:
+    blocks = markdown.split("\n\n")
+    res = []
+    for block in blocks:
+        block = block.strip()
+        if block == "":
+            continue
+        res.append(block)
+    return res
+
+
+def text_to_textnodes(text: str) -> List[TextNode]:
+    nodes = split_nodes_delimiter([TextNode(text, TextType.TEXT)], "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_pattern(nodes, re.compile(r'!\[([^\]]+)\]\(([^)]+)\)'), TextType.IMAGE)
+    nodes = split_nodes_pattern(nodes, re.compile(r'\[([^\]]+)\]\(([^)]+)\)'), TextType.LINK)
+    return nodes
+
+
+def split_nodes_delimiter(nodes: List[TextNode], delimiter: str, new_type: TextType) -> List[TextNode]:
+    result = []
+    for node in nodes:
+        parts = node.text.split(delimiter)
+        for i, part in enumerate(parts):
+            if part:
+                if i % 2 == 0:
+                    result.append(TextNode(part, node.text_type))
+                else:
+                    result.append(TextNode(part, new_type))
+    return result
+
+
+def split_nodes_pattern(nodes: List[TextNode], pattern: re.Pattern, new_type: TextType) -> List[TextNode]:
+    new_nodes = []
+    for node in nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        text = node.text
+        last_index = 0
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if start > last_index:
+                new_nodes.append(TextNode(text[last_index:start], TextType.TEXT))
+            label, url = match.groups()
+            new_nodes.append(TextNode(label, new_type, url))
+            last_index = end
+        if last_index < len(text):
+            new_nodes.append(TextNode(text[last_index:], TextType.TEXT))
+    return new_nodes
+
+
+def text_to_children(text: str) -> List[Leaf]:
+    return [text_node_to_leaf(node) for node in text_to_textnodes(text)]
+
+
+def markdown_to_html(markdown: str) -> str:
+    nodes = []
+    for block in markdown_to_blocks(markdown):
+        block_type = block_to_block_type(block)
+        if block_type == "heading":
+            level = block.count("#")
+            nodes.append(Parent(f"h{level}", text_to_children(block[level + 1:].strip())))
+        elif block_type == "code":
+            nodes.append(Parent("pre", [Leaf("code", block[3:-3])]))
+        elif block_type == "quote":
+            nodes.append(Parent("blockquote", text_to_children(block[2:].strip())))
+        elif block_type == "unordered_list":
+            nodes.append(Parent("ul", [Parent("li", text_to_children(line[2:].strip())) for line in block.split("\n")]))
+        elif block_type == "ordered_list":
+            nodes.append(Parent("ol", [Parent("li", text_to_children(line.split(". ")[1].strip())) for line in block.split("\n")]))
+        else:
+            nodes.append(Parent("p", text_to_children(block)))
+    return Parent("div", nodes).to_html()
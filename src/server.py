@@ -0,0 +1,283 @@
+import http.server
+import os
+import threading
+import time
+from functools import partial
+from typing import List
+from assets import place_file
+from blockcache import BlockCache
+from build import build_site
+from discovery import is_page
+from helpers import collect_pages, generate_page
+from imagesize import image_url, is_image, read_dimensions, sizes_digest
+from manifest import Manifest, MANIFEST_PATH, file_hash
+from siteindex import index_path_for
+import imagesize
+import siteindex
+
+LIVERELOAD_PATH = "/__livereload"
+LIVERELOAD_SCRIPT = '<script>new EventSource("/__livereload").onmessage = () => location.reload();</script>'
+
+
+def snapshot(paths: List[str]) -> dict[str, tuple[int, int]]:
+    files = {}
+    for path in paths:
+        if os.path.isdir(path):
+            scan_directory(path, files)
+        elif os.path.isfile(path):
+            stat = os.stat(path)
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def scan_directory(directory: str, files: dict[str, tuple[int, int]]):
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                scan_directory(entry.path, files)
+            elif entry.is_file():
+                stat = entry.stat()
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+
+def diff_snapshots(old: dict[str, tuple[int, int]], new: dict[str, tuple[int, int]]) -> set[str]:
+    changed = {path for path, stamp in new.items() if old.get(path) != stamp}
+    changed.update(path for path in old if path not in new)
+    return changed
+
+
+class Watcher:
+    def __init__(self, paths: List[str], interval: float=0.05, debounce: float=0.03):
+        self.paths = paths
+        self.interval = interval
+        self.debounce = debounce
+        self.files = snapshot(paths)
+
+    def poll(self) -> set[str]:
+        files = snapshot(self.paths)
+        changed = diff_snapshots(self.files, files)
+        self.files = files
+        return changed
+
+    def wait_for_changes(self) -> set[str]:
+        changed = set()
+        while not changed:
+            time.sleep(self.interval)
+            changed = self.poll()
+        # Editors often save in several steps; wait for the tree to settle.
+        while True:
+            time.sleep(self.debounce)
+            more = self.poll()
+            if not more:
+                return changed
+            changed |= more
+
+
+class Reloader:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version: int, timeout: float=None) -> int:
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class SiteBuilder:
+    def __init__(
+            self,
+            content_path: str,
+            static_path: str,
+            template_path: str,
+            dest_path: str,
+            manifest_path: str=MANIFEST_PATH
+            ):
+        self.content_path = content_path
+        self.static_path = static_path
+        self.template_path = template_path
+        self.dest_path = dest_path
+        self.manifest_path = manifest_path
+        self.manifest = None
+        self.index = None
+        self.image_sizes = None
+        # Kept in memory for the life of the server; most edits touch one block.
+        self.cache = BlockCache()
+
+    def build(self) -> dict[str, int]:
+        stats = build_site(self.content_path, self.static_path, self.template_path, self.dest_path, True, self.manifest_path, cache=self.cache)
+        self.manifest = Manifest.load(self.manifest_path)
+        self.index = stats["index"]
+        self.image_sizes = stats["image_sizes"]
+        return stats
+
+    def rebuild(self, changed: set[str]) -> int:
+        rendered = set()
+        if self.template_path in changed:
+            self.manifest.template = file_hash(self.template_path)
+            for src, dest in collect_pages(self.content_path, self.dest_path):
+                self.update_page(src, dest)
+                rendered.add(src)
+        rebuilt = len(rendered)
+        for path in sorted(changed - rendered):
+            if self.is_under(path, self.content_path):
+                # Swap files, drafts and other non-pages never become outputs.
+                if not is_page(os.path.relpath(path, self.content_path)):
+                    continue
+                dest = os.path.splitext(os.path.join(self.dest_path, os.path.relpath(path, self.content_path)))[0] + ".html"
+                self.update_page(path, dest)
+                rebuilt += 1
+            elif self.is_under(path, self.static_path):
+                dest = os.path.join(self.dest_path, os.path.relpath(path, self.static_path))
+                self.update_static(path, dest)
+                rebuilt += 1
+                if is_image(path) and self.update_image_size(path, dest):
+                    # Pages embedding the image carry its old width and height.
+                    url = image_url(dest, self.dest_path)
+                    for src, entry in list(self.index.pages.items()):
+                        if url in entry["images"] and src not in rendered:
+                            self.update_page(src, entry["output"])
+                            rendered.add(src)
+                            rebuilt += 1
+        self.manifest.save(self.manifest_path)
+        self.index.save(index_path_for(self.manifest_path))
+        return rebuilt
+
+    def update_page(self, src: str, dest: str):
+        if not os.path.isfile(src):
+            self.manifest.pages.pop(src, None)
+            self.index.pages.pop(src, None)
+            remove_file(dest)
+            return
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        siteindex.active = siteindex.PageRecord()
+        imagesize.active = self.image_sizes
+        try:
+            generate_page(src, self.template_path, dest, cache=self.cache)
+            self.index.update(src, siteindex.active.entry(dest, os.path.getsize(src)))
+        finally:
+            siteindex.active = None
+            imagesize.active = None
+        self.manifest.pages[src] = {"hash": file_hash(src), "output": dest}
+
+    def update_static(self, src: str, dest: str):
+        if not os.path.isfile(src):
+            self.manifest.static.pop(src, None)
+            remove_file(dest)
+            return
+        place_file(src, dest)
+        self.manifest.static[src] = {"output": dest}
+
+    def update_image_size(self, src: str, dest: str) -> bool:
+        url = image_url(dest, self.dest_path)
+        dimensions = read_dimensions(src) if os.path.isfile(src) else None
+        if self.image_sizes.get(url) == dimensions:
+            return False
+        if dimensions is None:
+            self.image_sizes.pop(url)
+        else:
+            self.image_sizes[url] = dimensions
+        self.manifest.images = sizes_digest(self.image_sizes)
+        self.cache.salt = (self.manifest.assets or "") + self.manifest.images
+        return True
+
+    def is_under(self, path: str, directory: str) -> bool:
+        return os.path.commonpath([os.path.abspath(path), os.path.abspath(directory)]) == os.path.abspath(directory)
+
+
+def remove_file(path: str):
+    if os.path.isfile(path):
+        os.remove(path)
+
+
+class DevRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        reloader = self.server.reloader
+        if reloader is not None and self.path == LIVERELOAD_PATH:
+            self.stream_reloads(reloader)
+            return
+        url_path = self.path.split("?", 1)[0].split("#", 1)[0]
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and url_path.endswith("/"):
+            path = os.path.join(path, "index.html")
+        if reloader is None or not path.endswith(".html") or not os.path.isfile(path):
+            super().do_GET()
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        script = LIVERELOAD_SCRIPT.encode()
+        if b"</body>" in body:
+            body = body.replace(b"</body>", script + b"</body>", 1)
+        else:
+            body += script
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reloads(self, reloader: Reloader):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        version = reloader.version
+        try:
+            while True:
+                latest = reloader.wait(version, timeout=15)
+                if latest == version:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    self.wfile.write(b"data: reload\n\n")
+                    version = latest
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class DevServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], dest_path: str, reloader: Reloader=None):
+        super().__init__(address, partial(DevRequestHandler, directory=dest_path))
+        self.reloader = reloader
+
+
+def serve(
+        content_path: str,
+        static_path: str,
+        template_path: str,
+        dest_path: str,
+        port: int=8888,
+        watch: bool=False
+        ):
+    builder = SiteBuilder(content_path, static_path, template_path, dest_path)
+    builder.build()
+    reloader = Reloader() if watch else None
+    server = DevServer(("", port), dest_path, reloader)
+    print(f"Serving {dest_path} on http://localhost:{port}/")
+    if not watch:
+        server.serve_forever()
+        return
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    watcher = Watcher([content_path, static_path, template_path])
+    try:
+        while True:
+            changed = watcher.wait_for_changes()
+            start = time.perf_counter()
+            try:
+                rebuilt = builder.rebuild(changed)
+            except (ValueError, OSError) as e:
+                print(f"Rebuild failed: {e}")
+                continue
+            reloader.notify()
+            print(f"Rebuilt {rebuilt} file(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,97 @@
+import filecmp
+import hashlib
+import os
+from typing import List
+from assets import collect_static, is_up_to_date, place_file, prune_outputs
+from siteindex import SiteIndex
+
+SHARD_PLANS = ("hash", "size")
+
+
+def parse_shard(text: str) -> tuple[int, int]:
+    index, sep, count = text.partition("/")
+    if not sep or not index.isdigit() or not count.isdigit() or not 1 <= int(index) <= int(count):
+        raise ValueError(f"invalid shard {text!r}, expected i/N with 1 <= i <= N")
+    return int(index), int(count)
+
+
+def shard_name(path: str, index: int, count: int) -> str:
+    return f"{path}-shard-{index}-of-{count}"
+
+
+def shard_build_path(path: str, index: int, count: int) -> str:
+    # .build/manifest.json -> .build-shard-2-of-4/manifest.json, keeping each
+    # shard's manifest, site index and block cache apart.
+    return os.path.join(shard_name(os.path.dirname(path), index, count), os.path.basename(path))
+
+
+def hash_shard(relative_path: str, count: int) -> int:
+    # A content hash of the path, unlike hash(), agrees across machines and runs.
+    digest = hashlib.sha256(relative_path.replace(os.sep, "/").encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def plan_shards(pages: List[tuple[str, str]], content_path: str, count: int, plan: str="hash") -> dict[str, int]:
+    if plan == "hash":
+        return {src: hash_shard(os.path.relpath(src, content_path), count) for src, _ in pages}
+    if plan != "size":
+        raise ValueError(f"unknown shard plan {plan!r}")
+    # Largest pages first onto the least loaded shard; ties break on path so
+    # every node computes the same plan from the same checkout.
+    loads = [0] * count
+    assignment = {}
+    for size, src in sorted(((os.path.getsize(src), src) for src, _ in pages), key=lambda item: (-item[0], item[1])):
+        shard = min(range(count), key=lambda i: loads[i])
+        loads[shard] += size
+        assignment[src] = shard + 1
+    return assignment
+
+
+def select_shard(
+        pages: List[tuple[str, str]],
+        content_path: str,
+        index: int,
+        count: int,
+        plan: str="hash"
+        ) -> List[tuple[str, str]]:
+    assignment = plan_shards(pages, content_path, count, plan)
+    return [(src, dest) for src, dest in pages if assignment[src] == index]
+
+
+def merge_shards(
+        shard_paths: List[str],
+        dest_path: str,
+        index_paths: List[str]=None,
+        index_path: str=None
+        ) -> dict[str, int]:
+    # A missing shard would look like a shard with no pages, and pruning
+    # would then delete its pages from dest_path and from the index.
+    expected = list(shard_paths) + (list(index_paths) if index_paths is not None and index_path is not None else [])
+    for path in expected:
+        if not os.path.exists(path):
+            raise ValueError(f"missing shard output {path}; build every shard before merging")
+    outputs = {}
+    for shard_path in shard_paths:
+        for src, dest in collect_static(shard_path, dest_path):
+            previous = outputs.get(dest)
+            if previous is None:
+                outputs[dest] = src
+            # Site-wide files such as static assets are written by every shard
+            # and must agree byte for byte; anything else is a conflict.
+            elif not filecmp.cmp(previous, src, shallow=False):
+                raise ValueError(f"shards disagree on {os.path.relpath(dest, dest_path)}: {previous} and {src}")
+    stats = {"files": len(outputs), "merged": 0}
+    for dest, src in outputs.items():
+        if not is_up_to_date(src, dest):
+            place_file(src, dest)
+            stats["merged"] += 1
+    stats["removed"] = prune_outputs(dest_path, set(outputs))
+
+    if index_paths is not None and index_path is not None:
+        index = SiteIndex()
+        for shard_path, shard_index_path in zip(shard_paths, index_paths):
+            for source, entry in SiteIndex.load(shard_index_path).pages.items():
+                entry["output"] = os.path.join(dest_path, os.path.relpath(entry["output"], shard_path))
+                index.update(source, entry)
+        index.save(index_path)
+    return stats
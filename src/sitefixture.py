@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from build import build_site
+
+
+class SiteTestCase(unittest.TestCase):
+    # A site tree (content/, static/, template.html, public/ and a manifest
+    # path) under a temporary directory. Subclasses write their pages and
+    # template in setUp after calling super().setUp().
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.template = os.path.join(self.root, "template.html")
+        self.public = os.path.join(self.root, "public")
+        self.manifest = os.path.join(self.root, ".build", "manifest.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path: str, data: str | bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+        # Bump the mtime so a rewrite is visible to mtime checks even on
+        # coarse clocks.
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def read(self, path: str) -> str:
+        with open(path, "r") as f:
+            return f.read()
+
+    def build(self, incremental: bool=True, **options) -> dict:
+        return build_site(self.content, self.static, self.template, self.public, incremental, self.manifest, **options)
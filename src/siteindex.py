@@ -0,0 +1,81 @@
+import os
+from typing import Iterable, List
+from manifest import load_json, save_json
+from textnode import TextNode, TextType
+
+SITE_INDEX_PATH = os.path.join(".build", "site-index.json")
+
+
+class PageRecord:
+    __slots__ = ("title", "links", "images")
+
+    def __init__(self):
+        self.title: str = None
+        self.links: List[str] = []
+        self.images: List[str] = []
+
+    def extend(self, links: List[str], images: List[str]):
+        self.links.extend(links)
+        self.images.extend(images)
+
+    def entry(self, output: str, size: int) -> dict:
+        return {"output": output, "title": self.title, "links": self.links, "images": self.images, "bytes": size}
+
+    def __repr__(self):
+        return f"PageRecord({self.title}, {len(self.links)} links, {len(self.images)} images)"
+
+
+# Record for the page being rendered; inline parsing appends to it.
+active: PageRecord | None = None
+
+
+def record_nodes(nodes: Iterable[TextNode]):
+    for node in nodes:
+        if node.text_type == TextType.LINK:
+            active.links.append(node.url)
+        elif node.text_type == TextType.IMAGE:
+            active.images.append(node.url)
+
+
+def index_path_for(manifest_path: str) -> str:
+    # The index sits next to the build manifest so both move together.
+    return os.path.join(os.path.dirname(manifest_path), "site-index.json")
+
+
+def output_url(output: str, dest_path: str) -> str:
+    # Outputs are built by joining onto dest_path, so slicing the prefix off
+    # is exact and much cheaper than relpath's two abspath calls.
+    prefix = os.path.join(dest_path, "")
+    if output.startswith(prefix):
+        relative = output[len(prefix):]
+    else:
+        relative = os.path.relpath(output, dest_path)
+    url = "/" + relative.replace(os.sep, "/")
+    if url.endswith("/index.html"):
+        return url[:-len("index.html")]
+    return url
+
+
+class SiteIndex:
+    def __init__(self, pages: dict[str, dict]=None):
+        self.pages = pages if pages is not None else {}
+
+    @classmethod
+    def load(cls, path: str=SITE_INDEX_PATH) -> 'SiteIndex':
+        return cls(load_json(path))
+
+    def save(self, path: str=SITE_INDEX_PATH):
+        save_json(path, self.pages, separators=(",", ":"), sort_keys=True)
+
+    def update(self, source: str, record: dict):
+        self.pages[source] = record
+
+    def retain(self, sources: Iterable[str]):
+        live = set(sources)
+        self.pages = {source: entry for source, entry in self.pages.items() if source in live}
+
+    def by_url(self, dest_path: str) -> dict[str, dict]:
+        return {output_url(entry["output"], dest_path): entry for entry in self.pages.values()}
+
+    def __repr__(self):
+        return f"SiteIndex({len(self.pages)} pages)"
@@ -0,0 +1,63 @@
+import os
+import re
+from typing import List, TextIO
+from htmlnode import HTMLNode
+import fingerprint
+
+SLOT_PATTERN = re.compile(r"\{\{ (\w+) \}\}")
+
+
+class Template:
+    def __init__(self, text: str):
+        self.segments: List[str] = []
+        self.slots: List[str] = []
+        self.placeholders: List[str] = []
+        last_index = 0
+        for match in SLOT_PATTERN.finditer(text):
+            self.segments.append(text[last_index:match.start()])
+            self.slots.append(match.group(1))
+            self.placeholders.append(match.group(0))
+            last_index = match.end()
+        self.segments.append(text[last_index:])
+
+    @classmethod
+    def load(cls, path: str) -> 'Template':
+        with open(path, "r") as f:
+            return cls(f.read())
+
+    def parts(self, values: dict[str, str | HTMLNode]):
+        # Slots without a value are emitted verbatim, like an unmatched str.replace.
+        yield self.segments[0]
+        for slot, placeholder, segment in zip(self.slots, self.placeholders, self.segments[1:]):
+            value = values.get(slot, placeholder)
+            if isinstance(value, HTMLNode):
+                yield from value.iter_html()
+            else:
+                yield value
+            yield segment
+
+    def render(self, values: dict[str, str | HTMLNode]) -> str:
+        return "".join(self.parts(values))
+
+    def write(self, f: TextIO, values: dict[str, str | HTMLNode]):
+        f.writelines(self.parts(values))
+
+    def __repr__(self):
+        return f"Template({self.slots})"
+
+
+_compiled: dict[str, tuple[int, dict[str, str] | None, Template]] = {}
+
+
+def load_template(path: str) -> Template:
+    mtime = os.stat(path).st_mtime_ns
+    cached = _compiled.get(path)
+    if cached is not None and cached[0] == mtime and cached[1] is fingerprint.active:
+        return cached[2]
+    with open(path, "r") as f:
+        text = f.read()
+    if fingerprint.active is not None:
+        text = fingerprint.rewrite_urls(text, fingerprint.active)
+    template = Template(text)
+    _compiled[path] = (mtime, fingerprint.active, template)
+    return template
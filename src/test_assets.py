@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from assets import place_file, prune_outputs, sync_static
+
+
+class TestSyncStatic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "a.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path, "r") as f:
+            return f.read()
+
+    def test_first_sync_places_everything(self):
+        files, stats = sync_static(self.static, self.public)
+        self.assertEqual(len(files), 2)
+        self.assertEqual(stats["static_copied"], 2)
+        self.assertEqual(self.read(os.path.join(self.public, "images", "a.png")), "png")
+
+    def test_second_sync_skips_unchanged(self):
+        sync_static(self.static, self.public)
+        _, stats = sync_static(self.static, self.public)
+        self.assertEqual(stats["static_copied"], 0)
+        self.assertEqual(stats["static_skipped"], 2)
+
+    def test_replaced_source_is_synced(self):
+        sync_static(self.static, self.public, link=False)
+        path = os.path.join(self.static, "index.css")
+        os.remove(path)
+        self.write(path, "body { color: red }")
+        _, stats = sync_static(self.static, self.public, link=False)
+        self.assertEqual(stats["static_copied"], 1)
+        self.assertEqual(self.read(os.path.join(self.public, "index.css")), "body { color: red }")
+
+    def test_place_file_without_link_is_independent_copy(self):
+        dest = os.path.join(self.public, "copy.css")
+        place_file(os.path.join(self.static, "index.css"), dest, link=False)
+        self.assertFalse(os.path.samefile(os.path.join(self.static, "index.css"), dest))
+        self.assertEqual(self.read(dest), "body {}")
+
+    def test_prune_outputs(self):
+        sync_static(self.static, self.public)
+        self.write(os.path.join(self.public, "old", "stale.html"), "x")
+        removed = prune_outputs(self.public, {os.path.join(self.public, "index.css"), os.path.join(self.public, "images", "a.png")})
+        self.assertEqual(removed, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "old")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.css")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from helpers import block_to_block_type, BlockType
+from helpers import block_to_block_type, classify_block, BlockType
 
 class TestBlockToBlockType(unittest.TestCase):
 
@@ -35,5 +35,24 @@ class TestBlockToBlockType(unittest.TestCase):
         block = "This is a normal paragraph."
         self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
 
+    def test_seven_hashes_is_paragraph(self):
+        self.assertEqual(block_to_block_type("####### Too deep"), BlockType.PARAGRAPH)
+
+    def test_hash_without_space_is_paragraph(self):
+        self.assertEqual(block_to_block_type("#hashtag"), BlockType.PARAGRAPH)
+
+    def test_mixed_list_markers_is_paragraph(self):
+        self.assertEqual(block_to_block_type("* Item 1\n- Item 2"), BlockType.PARAGRAPH)
+
+    def test_ordered_list_out_of_order(self):
+        self.assertEqual(block_to_block_type("1. First\n3. Third"), BlockType.PARAGRAPH)
+
+    def test_partial_quote_is_paragraph(self):
+        self.assertEqual(block_to_block_type("> quoted\nnot quoted"), BlockType.PARAGRAPH)
+
+    def test_classify_block_heading_level(self):
+        self.assertEqual(classify_block(["### Third"]), (BlockType.HEADING, 3))
+        self.assertEqual(classify_block(["* a", "* b"]), (BlockType.UNORDERED_LIST, 0))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
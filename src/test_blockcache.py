@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from blockcache import BlockCache
+from build import build_site
+from helpers import markdown_to_html_node
+
+
+class TestBlockCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "blocks.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hits_and_misses(self):
+        cache = BlockCache(self.path)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", ["<p>a</p>", [], []])
+        self.assertEqual(cache.get("a"), ["<p>a</p>", [], []])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = BlockCache(self.path, max_bytes=10)
+        cache.put("a", ["aaaa", [], []])
+        cache.put("b", ["bbbb", [], []])
+        cache.get("a")
+        cache.put("c", ["cccc", [], []])
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual(cache.size, 8)
+
+    def test_save_and_load(self):
+        cache = BlockCache(self.path)
+        cache.put("a", ["<p>a</p>", [], []])
+        cache.save()
+        self.assertEqual(BlockCache(self.path).load().get("a"), ["<p>a</p>", [], []])
+
+    def test_version_change_invalidates(self):
+        cache = BlockCache(self.path, version="1")
+        cache.put("a", ["<p>a</p>", [], []])
+        cache.save()
+        self.assertEqual(len(BlockCache(self.path, version="2").load().entries), 0)
+
+    def test_markdown_to_html_node_uses_cache(self):
+        markdown = "# Title\n\nSome **bold** text\n\n* one\n* two"
+        cache = BlockCache(self.path)
+        first = markdown_to_html_node(markdown, cache).to_html()
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+        second = markdown_to_html_node(markdown.replace("bold", "strong"), cache).to_html()
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        self.assertEqual(first, markdown_to_html_node(markdown).to_html())
+        self.assertIn("<b>strong</b>", second)
+
+    def test_rejected_with_pool_workers(self):
+        with self.assertRaises(ValueError):
+            build_site("content", "static", "template.html", self.tmp.name, workers=2, cache=BlockCache(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
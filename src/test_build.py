@@ -0,0 +1,75 @@
+import os
+import unittest
+from sitefixture import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+
+class TestBuildSite(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nHello")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(self.template, TEMPLATE)
+
+    def test_full_build(self):
+        stats = self.build(incremental=False)
+        self.assertEqual(stats["pages_built"], 2)
+        self.assertEqual(stats["static_copied"], 1)
+        self.assertEqual(self.read(os.path.join(self.public, "blog", "post.html")), "<title>Post</title><main><div><h1>Post</h1><p>Hello</p></div></main>")
+        self.assertTrue(os.path.exists(self.manifest))
+
+    def test_front_matter_fills_template_slots(self):
+        self.write(self.template, "<meta name=\"author\" content=\"{{ Author }}\"><title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "---\nAuthor: Bilbo\n---\n# Home\n\nWelcome")
+        self.build(incremental=False)
+        self.assertEqual(self.read(os.path.join(self.public, "index.html")), '<meta name="author" content="Bilbo"><title>Home</title><div><h1>Home</h1><p>Welcome</p></div>')
+        self.assertIn('content="{{ Author }}"', self.read(os.path.join(self.public, "blog", "post.html")))
+
+    def test_incremental_skips_unchanged(self):
+        self.build()
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 0)
+        self.assertEqual(stats["pages_skipped"], 2)
+        self.assertEqual(stats["static_skipped"], 1)
+
+    def test_incremental_rebuilds_changed_page(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 1)
+        self.assertIn("Changed", self.read(os.path.join(self.public, "index.html")))
+
+    def test_template_change_rebuilds_all(self):
+        self.build()
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 2)
+
+    def test_removed_sources_delete_outputs(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        os.remove(os.path.join(self.static, "index.css"))
+        stats = self.build()
+        self.assertEqual(stats["removed"], 2)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog", "post.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.css")))
+
+    def test_missing_output_is_regenerated(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_page_never_writes_through_linked_asset(self):
+        # The asset is hardlinked into public/ before the page replaces it.
+        self.write(os.path.join(self.static, "index.html"), "<p>static</p>")
+        self.build(incremental=False)
+        self.assertEqual(self.read(os.path.join(self.static, "index.html")), "<p>static</p>")
+        self.assertIn("Welcome", self.read(os.path.join(self.public, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
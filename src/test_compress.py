@@ -0,0 +1,85 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+import compress
+from compress import compress_file, compress_outputs
+from sitefixture import SiteTestCase
+
+
+class TestCompressFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_writes_gzip_sibling(self):
+        path = self.write("page.html", b"<p>hello</p>" * 100)
+        entry = compress_file(path, use_brotli=False)
+        self.assertEqual(entry["gz"], path + ".gz")
+        self.assertNotIn("br", entry)
+        with gzip.open(path + ".gz") as f:
+            self.assertEqual(f.read(), b"<p>hello</p>" * 100)
+
+    def test_skips_small_and_incompressible(self):
+        small = self.write("small.css", b"body {}")
+        noise = self.write("noise.js", os.urandom(4096))
+        self.assertNotIn("gz", compress_file(small, use_brotli=False))
+        self.assertNotIn("gz", compress_file(noise, use_brotli=False))
+        self.assertFalse(os.path.exists(noise + ".gz"))
+
+    def test_only_changed_files_recompressed(self):
+        page = self.write("page.html", b"<p>hello</p>" * 100)
+        image = self.write("image.png", b"\x89PNG" * 100)
+        entries, count = compress_outputs([page, image], workers=1, use_brotli=False)
+        self.assertEqual(list(entries), [page])
+        self.assertEqual(count, 1)
+        with mock.patch.object(compress, "compress_file") as compress_file_mock:
+            again, count = compress_outputs([page, image], entries, workers=1, use_brotli=False)
+        compress_file_mock.assert_not_called()
+        self.assertEqual((again, count), (entries, 0))
+        self.write("page.html", b"<p>changed</p>" * 100)
+        os.utime(page, ns=(0, entries[page]["mtime"] + 1))
+        _, count = compress_outputs([page, image], entries, workers=1, use_brotli=False)
+        self.assertEqual(count, 1)
+
+
+class TestCompressBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n" + "Some words here. " * 50)
+        self.write(os.path.join(self.content, "old.md"), "# Old\n\n" + "Old words here. " * 50)
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0; }\n" * 50)
+        self.write(self.template, "<html>{{ Content }}</html>")
+
+    def test_siblings_follow_outputs(self):
+        stats = self.build(compress=True)
+        self.assertEqual(stats["compressed"], 3)
+        for name in ("index.html.gz", "old.html.gz", "index.css.gz"):
+            self.assertTrue(os.path.exists(os.path.join(self.public, name)))
+        self.assertEqual(self.build(compress=True)["compressed"], 0)
+        os.remove(os.path.join(self.content, "old.md"))
+        self.build(compress=True)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "old.html.gz")))
+        self.build(incremental=False)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.html.gz")))
+
+    def test_full_builds_only_recompress_changed_outputs(self):
+        self.assertEqual(self.build(incremental=False, compress=True)["compressed"], 3)
+        self.assertEqual(self.build(incremental=False, compress=True)["compressed"], 0)
+        self.write(os.path.join(self.content, "old.md"), "# Old\n\n" + "New words here. " * 50)
+        self.assertEqual(self.build(incremental=False, compress=True)["compressed"], 1)
+        with gzip.open(os.path.join(self.public, "old.html.gz")) as f:
+            self.assertIn(b"New words", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from discovery import discover_pages, is_page
+from helpers import generate_pages_recursive
+
+
+class TestDiscoverPages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        for name in (
+            "index.md",
+            "blog/b.md",
+            "blog/a.md",
+            "blog/.a.md.swp",
+            "blog/a.md~",
+            "_drafts/soon.md",
+            "notes/_wip.md",
+            ".git/HEAD.md",
+            "images/photo.png",
+            "README.txt",
+        ):
+            path = os.path.join(self.content, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("# Title\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def relative(self, pages):
+        return [(os.path.relpath(src, self.content), os.path.relpath(dest, "public")) for src, dest in pages]
+
+    def test_flat_sorted_markdown_only(self):
+        self.assertEqual(self.relative(discover_pages(self.content, "public")), [
+            (os.path.join("blog", "a.md"), os.path.join("blog", "a.html")),
+            (os.path.join("blog", "b.md"), os.path.join("blog", "b.html")),
+            ("index.md", "index.html"),
+        ])
+
+    def test_path_patterns(self):
+        pages = self.relative(discover_pages(self.content, "public", ignore=[".*", "blog/b.md", "notes/*"]))
+        self.assertEqual([src for src, _ in pages], [os.path.join("_drafts", "soon.md"), os.path.join("blog", "a.md"), "index.md"])
+
+    def test_single_file_and_missing(self):
+        path = os.path.join(self.content, "index.md")
+        self.assertEqual(discover_pages(path, os.path.join("public", "index.md")), [(path, os.path.join("public", "index.html"))])
+        self.assertEqual(discover_pages(os.path.join(self.content, "missing"), "public"), [])
+
+    def test_is_page(self):
+        self.assertTrue(is_page(os.path.join("blog", "a.md")))
+        self.assertFalse(is_page(os.path.join("blog", ".a.md.swp")))
+        self.assertFalse(is_page(os.path.join("_drafts", "soon.md")))
+        self.assertFalse(is_page("README.txt"))
+
+    def test_generate_pages_recursive_skips_non_pages(self):
+        template = os.path.join(self.tmp.name, "template.html")
+        with open(template, "w") as f:
+            f.write("{{ Content }}")
+        public = os.path.join(self.tmp.name, "public")
+        generate_pages_recursive(self.content, template, public)
+        outputs = sorted(os.path.relpath(os.path.join(root, name), public) for root, _, names in os.walk(public) for name in names)
+        self.assertEqual(outputs, [os.path.join("blog", "a.html"), os.path.join("blog", "b.html"), "index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
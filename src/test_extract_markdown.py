@@ -1,5 +1,5 @@
 import unittest
-from helpers import extract_markdown_images, extract_markdown_links, extract_title
+from helpers import extract_markdown_images, extract_markdown_links, extract_title, read_front_matter
 
 class TestExtractMarkupImage(unittest.TestCase):
     def test_extract_markdown_images(self):
@@ -66,4 +66,16 @@ class TestExtractTitle(unittest.TestCase):
     def test_improper_format(self):
         markdown = "## Not a main title"
         with self.assertRaises(ValueError):
-            extract_title(markdown)
\ No newline at end of file
+            extract_title(markdown)
+
+class TestReadFrontMatter(unittest.TestCase):
+
+    def test_values_up_to_fence(self):
+        lines = iter(["Author: Bilbo\n", "Date: 2024-01-02\n", "no colon\n", "---\n", "# Title\n"])
+        self.assertEqual(read_front_matter(lines), {"Author": "Bilbo", "Date": "2024-01-02"})
+        self.assertEqual(next(lines), "# Title\n")
+
+    def test_unclosed(self):
+        with self.assertRaises(ValueError):
+            read_front_matter(["Author: Bilbo\n", "# Title\n"])
+
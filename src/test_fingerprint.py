@@ -0,0 +1,78 @@
+import json
+import os
+import unittest
+from unittest import mock
+import fingerprint
+from fingerprint import fingerprint_name, rewrite_urls
+from sitefixture import SiteTestCase
+from textnode import TextNode, TextType, text_node_to_html_node
+
+
+class TestFingerprintHelpers(unittest.TestCase):
+    def tearDown(self):
+        fingerprint.active = None
+
+    def test_fingerprint_name(self):
+        self.assertEqual(fingerprint_name("/images/a.png", "0123456789abcdef"), "/images/a.0123456789.png")
+
+    def test_rewrite_urls(self):
+        html = '<link href="/index.css" rel="stylesheet"><img src="/a.png"><a href="/other">'
+        urls = {"/index.css": "/index.abc.css", "/a.png": "/a.def.png"}
+        self.assertEqual(rewrite_urls(html, urls), '<link href="/index.abc.css" rel="stylesheet"><img src="/a.def.png"><a href="/other">')
+
+    def test_text_nodes_resolve_active_urls(self):
+        fingerprint.active = {"/a.png": "/a.def.png"}
+        node = text_node_to_html_node(TextNode("alt", TextType.IMAGE, "/a.png"))
+        self.assertEqual(node.props["src"], "/a.def.png")
+        node = text_node_to_html_node(TextNode("link", TextType.LINK, "/page"))
+        self.assertEqual(node.props, {"href": "/page"})
+
+
+class TestFingerprintBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n![logo](/images/logo.png)")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "logo.png"), "png")
+        self.write(self.template, '<link href="/index.css">{{ Content }}')
+
+    def asset_urls(self):
+        with open(os.path.join(self.public, "asset-manifest.json")) as f:
+            return json.load(f)
+
+    def test_hashed_assets_and_references(self):
+        self.build(fingerprint_assets=True)
+        urls = self.asset_urls()
+        self.assertEqual(set(urls), {"/index.css", "/images/logo.png"})
+        for url in urls.values():
+            self.assertTrue(os.path.exists(os.path.join(self.public, url.lstrip("/"))))
+        html = self.read(os.path.join(self.public, "index.html"))
+        self.assertIn(f'href="{urls["/index.css"]}"', html)
+        self.assertIn(f'src="{urls["/images/logo.png"]}"', html)
+        self.assertIsNone(fingerprint.active)
+
+    def test_full_builds_reuse_asset_digests(self):
+        self.build(incremental=False, fingerprint_assets=True)
+        urls = self.asset_urls()
+        with mock.patch.object(fingerprint, "file_hash") as file_hash_mock:
+            self.build(incremental=False, fingerprint_assets=True)
+        file_hash_mock.assert_not_called()
+        self.assertEqual(self.asset_urls(), urls)
+
+    def test_changed_asset_rebuilds_pages_and_drops_old_hash(self):
+        self.build(fingerprint_assets=True)
+        old_hashed = os.path.join(self.public, self.asset_urls()["/index.css"].lstrip("/"))
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        stats = self.build(fingerprint_assets=True)
+        self.assertEqual(stats["pages_built"], 1)
+        self.assertFalse(os.path.exists(old_hashed))
+
+    def test_disabling_removes_hashed_outputs(self):
+        self.build(fingerprint_assets=True)
+        self.build()
+        self.assertEqual(sorted(os.listdir(self.public)), ["images", "index.css", "index.html"])
+        self.assertEqual(os.listdir(os.path.join(self.public, "images")), ["logo.png"])
+
+
+if __name__ == "__main__":
+    unittest.main()
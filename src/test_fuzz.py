@@ -0,0 +1,37 @@
+import random
+import unittest
+from unittest import mock
+import fuzz
+import reference
+import textnode
+from textnode import TextType
+
+
+class TestDifferentialFuzz(unittest.TestCase):
+    def test_optimized_matches_reference(self):
+        for name, result in fuzz.run(iterations=40, seed=1).items():
+            self.assertEqual(result["mismatches"], [], name)
+
+    def test_reference_renders_original_html(self):
+        self.assertEqual(
+            reference.markdown_to_html("# Title\n\nSome **bold** and [a](/b)\n\n- one\n- two"),
+            '<div><h1>Title</h1><p>Some <b>bold</b> and <a href="/b">a</a></p><ul><li>one</li><li>two</li></ul></div>',
+        )
+
+    def test_reference_img_is_normalized(self):
+        self.assertEqual(reference.markdown_to_html("![a \"b\"](/c.png)"), '<div><p><img src="/c.png">a "b"</img></p></div>')
+        self.assertEqual(fuzz.reference_html("![a \"b\"](/c.png)"), '<div><p><img src="/c.png" alt="a &quot;b&quot;" loading="lazy" decoding="async"></p></div>')
+
+    def test_divergent_classes_check_specified_behaviour(self):
+        markdown, expected = fuzz.nested_document(random.Random(0))
+        self.assertEqual(fuzz.check(markdown, expected), [])
+        self.assertEqual(fuzz.check(markdown, expected.replace("<b>", "<strong>", 1)), ["tree", "stream", "cached"])
+
+    def test_detects_divergence(self):
+        with mock.patch.dict(textnode.INLINE_TAGS, {TextType.BOLD: ("<strong>", "</strong>")}):
+            self.assertEqual(fuzz.check("some **bold** text"), ["tree", "stream", "cached"])
+        self.assertEqual(fuzz.check("some **bold** text"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
+import io
 import unittest
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import HTMLNode, LeafNode, ParentNode, VoidNode
 
 class TestHTMLNode(unittest.TestCase):
     def test_empty_node(self):
@@ -83,6 +84,13 @@ class TestLeafNode(unittest.TestCase):
         self.assertEqual(node.props, {"src": "image.png", "alt": "An image"})
         self.assertEqual(node.to_html(), '<img src="image.png" alt="An image"></img>')
 
+    def test_void_node(self):
+        node = VoidNode("img", {"src": "image.png", "alt": "An image"})
+        self.assertEqual(node.to_html(), '<img src="image.png" alt="An image">')
+        self.assertEqual(VoidNode("br").to_html(), "<br>")
+        with self.assertRaises(ValueError):
+            VoidNode(None)
+
     def test_leaf_node_with_empty_props(self):
         node = LeafNode(tag="br", value="", props={})
         self.assertEqual(node.tag, "br")
@@ -215,6 +223,10 @@ class TestParentNode(unittest.TestCase):
             "HTMLNode(p, What a strange world, None, {'class': 'primary'})",
         )
 
+    def test_slotted(self):
+        for node in (HTMLNode(), LeafNode("p", "x"), ParentNode("div", [])):
+            self.assertFalse(hasattr(node, "__dict__"))
+
     def test_to_html_no_children(self):
         node = LeafNode("p", "Hello, world!")
         self.assertEqual(node.to_html(), "<p>Hello, world!</p>")
@@ -266,3 +278,25 @@ class TestParentNode(unittest.TestCase):
             node.to_html(),
             "<h2><b>Bold text</b>Normal text<i>italic text</i>Normal text</h2>",
         )
+
+    def test_iter_html_fragments(self):
+        node = ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")], {"class": "x"})
+        self.assertEqual(list(node.iter_html()), ['<p class="x">', "<b>Bold</b>", " text", "</p>"])
+
+    def test_write_html(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode(None, "one")]), ParentNode("li", [LeafNode(None, "two")])])
+        out = io.StringIO()
+        node.write_html(out)
+        self.assertEqual(out.getvalue(), node.to_html())
+        self.assertEqual(out.getvalue(), "<ul><li>one</li><li>two</li></ul>")
+
+    def test_deeply_nested(self):
+        node = LeafNode(None, "deep")
+        for _ in range(500):
+            node = ParentNode("blockquote", [node])
+        self.assertEqual(node.to_html(), "<blockquote>" * 500 + "deep" + "</blockquote>" * 500)
+
+    def test_iter_html_no_tag(self):
+        node = ParentNode(None, [LeafNode(None, "x")])
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
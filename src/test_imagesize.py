@@ -0,0 +1,109 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+import imagesize
+from imagesize import ImageSizeCache, measure_static, read_dimensions, sizes_path_for
+from sitefixture import SiteTestCase
+
+
+def png(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height) + b"\x08\x02\x00\x00\x00"
+
+
+def gif(width, height):
+    return b"GIF89a" + struct.pack("<HH", width, height) + b"\x00" * 8
+
+
+def jpeg(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    dqt = b"\xff\xdb" + struct.pack(">H", 67) + b"\x00" * 65
+    sof = b"\xff\xc2" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app0 + dqt + b"\xff\xff" + sof + b"\xff\xd9"
+
+
+def webp(chunk, payload):
+    return b"RIFF" + struct.pack("<I", 4 + len(payload)) + b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+
+
+class TestReadDimensions(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_formats(self):
+        lossy = webp(b"VP8 ", b"\x00\x00\x00\x9d\x01\x2a" + struct.pack("<HH", 320, 200) + b"\x00" * 4)
+        lossless = webp(b"VP8L", b"\x2f" + struct.pack("<I", (320 - 1) | (200 - 1) << 14) + b"\x00" * 4)
+        extended = webp(b"VP8X", b"\x00" * 4 + (320 - 1).to_bytes(3, "little") + (200 - 1).to_bytes(3, "little"))
+        cases = {
+            "a.png": png(1344, 896),
+            "a.gif": gif(16, 9),
+            "a.jpg": jpeg(800, 600),
+            "lossy.webp": lossy,
+            "lossless.webp": lossless,
+            "extended.webp": extended,
+        }
+        expected = {"a.png": (1344, 896), "a.gif": (16, 9), "a.jpg": (800, 600)}
+        for name, data in cases.items():
+            self.assertEqual(read_dimensions(self.write(name, data)), expected.get(name, (320, 200)), name)
+
+    def test_unreadable(self):
+        self.assertIsNone(read_dimensions(self.write("a.png", b"not an image")))
+        self.assertIsNone(read_dimensions(self.write("b.jpg", b"\xff\xd8\xff\xe0\x00")))
+        for chunk in (b"VP8 ", b"VP8L", b"VP8X"):
+            self.assertIsNone(read_dimensions(self.write("c.webp", b"RIFF\x00\x00\x00\x00WEBP" + chunk)), chunk)
+        self.assertIsNone(read_dimensions(os.path.join(self.tmp.name, "missing.png")))
+
+    def test_cache_rereads_only_changed_files(self):
+        path = self.write("a.png", png(10, 20))
+        cache = ImageSizeCache()
+        self.assertEqual(cache.dimensions(path), (10, 20))
+        cache.save(os.path.join(self.tmp.name, "sizes.json"))
+        cache = ImageSizeCache.load(os.path.join(self.tmp.name, "sizes.json"))
+        with mock.patch.object(imagesize, "read_dimensions") as read_mock:
+            self.assertEqual(cache.dimensions(path), (10, 20))
+        read_mock.assert_not_called()
+        self.write("a.png", png(30, 40))
+        os.utime(path, ns=(0, cache.entries[path][1] + 1))
+        self.assertEqual(cache.dimensions(path), (30, 40))
+
+    def test_measure_static(self):
+        image = self.write("a.png", png(10, 20))
+        text = self.write("a.css", b"body {}")
+        cache = ImageSizeCache({"gone.png": [1, 1, 1, 1]})
+        public = os.path.join(self.tmp.name, "public")
+        sizes = measure_static([(image, os.path.join(public, "images", "a.png")), (text, os.path.join(public, "a.css"))], public, cache)
+        self.assertEqual(sizes, {"/images/a.png": (10, 20)})
+        self.assertEqual(list(cache.entries), [image])
+
+
+class TestImageSizeBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n![A picture](/images/a.png)")
+        self.write(os.path.join(self.content, "other.md"), "# Other\n\nNo images here")
+        self.write(os.path.join(self.static, "images", "a.png"), png(64, 32))
+        self.write(self.template, "<html>{{ Content }}</html>")
+
+    def test_dimensions_reach_pages_and_changes_rebuild(self):
+        index = os.path.join(self.public, "index.html")
+        stats = self.build()
+        self.assertEqual(stats["image_sizes"], {"/images/a.png": (64, 32)})
+        self.assertIn('<img src="/images/a.png" alt="A picture" width="64" height="32" loading="lazy" decoding="async">', self.read(index))
+        self.assertTrue(os.path.exists(sizes_path_for(self.manifest)))
+        self.assertEqual(self.build()["pages_built"], 0)
+        self.write(os.path.join(self.static, "images", "a.png"), png(128, 64))
+        self.assertEqual(self.build()["pages_built"], 2)
+        self.assertIn('width="128" height="64"', self.read(index))
+
+if __name__ == "__main__":
+    unittest.main()
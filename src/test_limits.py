@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+import unittest
+import limits
+from helpers import generate_page, markdown_to_html_node, text_to_textnodes
+from limits import BudgetExceeded, PageBudget
+from sitefixture import SiteTestCase
+from textnode import TextNode, TextType
+
+
+def render_seconds(markdown: str) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        markdown_to_html_node(markdown).to_html()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class TestLinearTime(unittest.TestCase):
+    def test_unmatched_openers_scale_linearly(self):
+        # These used to backtrack to the end of the text from every opener.
+        for unit in ("[a ", "![a ", "[a](b ", "![", "[a *b `c ![d](e "):
+            small = render_seconds(unit * 4000)
+            large = render_seconds(unit * 16000)
+            # Quadratic work would be 16x; allow generous noise over 4x.
+            self.assertLess(large, small * 8, unit)
+
+    def test_matches_around_unmatched_openers(self):
+        self.assertEqual(text_to_textnodes("[a [b](/u)"), [
+            TextNode("[a ", TextType.TEXT),
+            TextNode("b", TextType.LINK, "/u"),
+        ])
+        self.assertEqual(text_to_textnodes("![a](b ![c](/d.png)"), [
+            TextNode("![a](b ", TextType.TEXT),
+            TextNode("c", TextType.IMAGE, "/d.png"),
+        ])
+
+
+class TestPageBudget(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "page.md")
+        self.dest = os.path.join(self.tmp.name, "page.html")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.src, "w") as f:
+            f.write("# Title\n\n" + "\n\n".join(f"paragraph {i}" for i in range(100)))
+        with open(self.template, "w") as f:
+            f.write("{{ Content }}")
+
+    def tearDown(self):
+        limits.active = PageBudget()
+        self.tmp.cleanup()
+
+    def test_size_budget(self):
+        limits.active = PageBudget(max_bytes=100)
+        with self.assertRaises(BudgetExceeded):
+            generate_page(self.src, self.template, self.dest)
+
+    def test_time_budget(self):
+        limits.active = PageBudget(max_seconds=-1)
+        with self.assertRaises(BudgetExceeded):
+            generate_page(self.src, self.template, self.dest)
+        self.assertIsNone(limits.active.deadline)
+
+    def test_default_budget_is_unlimited(self):
+        budget = PageBudget()
+        budget.start(self.src)
+        budget.check()
+        self.assertIsNone(budget.deadline)
+
+    def test_within_budget(self):
+        generate_page(self.src, self.template, self.dest)
+        self.assertTrue(os.path.exists(self.dest))
+        self.assertIsNone(limits.active.deadline)
+
+
+class TestBudgetBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "big.md"), "# Big\n\n" + "\n\n".join(f"paragraph {i}" for i in range(100)))
+        self.write(os.path.join(self.content, "small.md"), "# Small")
+        self.write(self.template, "{{ Content }}")
+
+    def tearDown(self):
+        limits.active = PageBudget()
+        super().tearDown()
+
+    def test_build_skips_and_reports_pages_over_budget(self):
+        limits.active = PageBudget(max_bytes=100)
+        stats = self.build(incremental=False)
+        self.assertEqual(list(stats["over_budget"]), [os.path.join(self.content, "big.md")])
+        self.assertEqual(stats["pages_built"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "big.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "small.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import unittest
+from linkcheck import check_links, live_urls, resolve_url
+from siteindex import SiteIndex
+from sitefixture import SiteTestCase
+
+
+class TestResolveUrl(unittest.TestCase):
+    def test_absolute(self):
+        self.assertEqual(resolve_url("/images/a.png?v=2#top", "/blog/"), "/images/a.png")
+
+    def test_relative(self):
+        self.assertEqual(resolve_url("../images/a.png", "/blog/post/"), "/blog/images/a.png")
+        self.assertEqual(resolve_url("other.html", "/about.html"), "/other.html")
+        self.assertEqual(resolve_url("sub/", "/blog/"), "/blog/sub/")
+
+    def test_external_and_fragments_skipped(self):
+        for url in ("https://example.com/", "//cdn.example.com/a.js", "mailto:me@example.com", "#section", ""):
+            self.assertIsNone(resolve_url(url, "/"))
+
+
+class TestCheckLinks(unittest.TestCase):
+    def test_directory_pages_and_assets(self):
+        live = live_urls([os.path.join("public", "index.html"), os.path.join("public", "blog", "index.html"), os.path.join("public", "a.png")], "public")
+        self.assertEqual(live, {"/", "/index.html", "/blog/", "/blog", "/blog/index.html", "/a.png"})
+
+    def test_reports_every_failure(self):
+        index = SiteIndex()
+        index.update("content/blog/index.md", {
+            "output": os.path.join("public", "blog", "index.html"),
+            "title": "Blog",
+            "links": ["/", "../missing", "https://example.com", "/blog"],
+            "images": ["../a.png", "b.png"],
+            "bytes": 0,
+        })
+        live = live_urls([os.path.join("public", "index.html"), os.path.join("public", "blog", "index.html"), os.path.join("public", "a.png")], "public")
+        self.assertEqual(check_links(index, live, "public"), [
+            ("content/blog/index.md", "link", "../missing"),
+            ("content/blog/index.md", "image", "b.png"),
+        ])
+
+
+class TestCheckLinksBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[post](/post) [gone](/gone) ![logo](/logo.png)")
+        self.write(os.path.join(self.content, "post", "index.md"), "# Post\n\n[home](../)")
+        self.write(os.path.join(self.static, "logo.png"), "png")
+        self.write(self.template, "{{ Content }}")
+
+    def test_skipped_pages_are_still_checked(self):
+        stats = self.build()
+        home = os.path.join(self.content, "index.md")
+        self.assertEqual(stats["broken_links"], [(home, "link", "/gone")])
+        os.remove(os.path.join(self.static, "logo.png"))
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 0)
+        self.assertEqual(stats["broken_links"], [(home, "link", "/gone"), (home, "image", "/logo.png")])
+
+
+if __name__ == "__main__":
+    unittest.main()
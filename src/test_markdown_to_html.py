@@ -1,5 +1,6 @@
+import io
 import unittest
-from helpers import markdown_to_blocks, markdown_to_html_node
+from helpers import BlockType, iter_blocks, markdown_to_blocks, markdown_to_html_node
 
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_markdown_to_blocks(self):
@@ -20,6 +21,28 @@ This is a paragraph of text. It has some **bold** and *italic* words inside of i
         blocks = markdown_to_blocks(text)
         self.assertEqual(blocks, expected_blocks)
 
+    def test_whitespace_only_lines_stay_in_block(self):
+        text = "first\n   \nstill first\n\n\n\n  second  \n"
+        self.assertEqual(markdown_to_blocks(text), ["first\n   \nstill first", "second"])
+
+
+class TestIterBlocks(unittest.TestCase):
+    def test_iter_blocks_from_file(self):
+        f = io.StringIO("# Title\n\n* one\n* two\n\n1. first\n2. second\n\nplain\ntext\n")
+        self.assertEqual(list(iter_blocks(f)), [
+            (BlockType.HEADING, ["# Title"]),
+            (BlockType.UNORDERED_LIST, ["* one", "* two"]),
+            (BlockType.ORDERED_LIST, ["1. first", "2. second"]),
+            (BlockType.PARAGRAPH, ["plain", "text"]),
+        ])
+
+    def test_iter_blocks_is_lazy(self):
+        def lines():
+            yield "first block"
+            yield ""
+            raise AssertionError("read past the first block")
+        self.assertEqual(next(iter_blocks(lines())), (BlockType.PARAGRAPH, ["first block"]))
+
 
 class TestMarkdownToHtmlNode(unittest.TestCase):
     def test_markdown_to_html_node(self):
@@ -41,4 +64,8 @@ print('Hello, World!')
 print('Hello, World!')
 </code></pre><ul><li>This is an unordered list</li></ul><ol><li>This is an ordered list</li></ol></div>"""
         html = markdown_to_html_node(text)
-        self.assertEqual(html.to_html(), expected_html)
\ No newline at end of file
+        self.assertEqual(html.to_html(), expected_html)
+
+    def test_heading_level_ignores_hashes_in_text(self):
+        html = markdown_to_html_node("## Learning C# fast")
+        self.assertEqual(html.to_html(), "<div><h2>Learning C# fast</h2></div>")
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from helpers import generate_pages_recursive
+from parallel import generate_pages_parallel, merge_worker_stats
+
+
+class TestGeneratePagesParallel(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        for i in range(6):
+            path = os.path.join(self.content, f"section{i % 2}", f"page{i}.md")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(f"# Page {i}\n\nSome **bold** text number {i}")
+        with open(self.template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_tree(self, root):
+        files = {}
+        for directory, _, names in os.walk(root):
+            for name in names:
+                path = os.path.join(directory, name)
+                with open(path, "r") as f:
+                    files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    def test_matches_sequential_build(self):
+        sequential = os.path.join(self.tmp.name, "sequential")
+        parallel = os.path.join(self.tmp.name, "parallel")
+        generate_pages_recursive(self.content, self.template, sequential)
+        workers = generate_pages_parallel(self.content, self.template, parallel, workers=2, chunk_size=2)
+        self.assertEqual(self.read_tree(parallel), self.read_tree(sequential))
+        self.assertEqual(sum(stats["pages"] for stats in workers.values()), 6)
+
+    def test_writer_threads_match_direct_writes(self):
+        direct = os.path.join(self.tmp.name, "direct")
+        queued = os.path.join(self.tmp.name, "queued")
+        generate_pages_parallel(self.content, self.template, direct, workers=1)
+        workers = generate_pages_parallel(self.content, self.template, queued, workers=1, writer_threads=2)
+        self.assertEqual(self.read_tree(queued), self.read_tree(direct))
+        self.assertEqual(sum(stats["written"] for stats in workers.values()), 6)
+        workers = generate_pages_parallel(self.content, self.template, queued, workers=1, writer_threads=2)
+        self.assertEqual(sum(stats["unchanged"] for stats in workers.values()), 6)
+
+    def test_merge_worker_stats(self):
+        def result(pid, pages, total_bytes, seconds):
+            return {"pid": pid, "pages": pages, "bytes": total_bytes, "seconds": seconds, "written": pages, "unchanged": 0}
+        workers = merge_worker_stats([result(1, 2, 100, 0.5), result(2, 1, 50, 0.25), result(1, 3, 10, 0.5)])
+        self.assertEqual(workers[1], {"pages": 5, "bytes": 110, "seconds": 1.0, "written": 5, "unchanged": 0})
+        self.assertEqual(workers[2]["pages"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
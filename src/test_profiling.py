@@ -0,0 +1,62 @@
+import unittest
+import profiling
+from helpers import markdown_to_html_node
+from profiling import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def tearDown(self):
+        profiling.active = None
+
+    def test_stage_records_self_time(self):
+        profiler = Profiler()
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                sum(range(10000))
+        outer = profiler.stages["outer"]
+        inner = profiler.stages["inner"]
+        self.assertEqual(outer["calls"], 1)
+        self.assertGreaterEqual(outer["wall"], inner["wall"])
+        self.assertAlmostEqual(outer["self_wall"], outer["wall"] - inner["wall"])
+
+    def test_trace_events(self):
+        profiler = Profiler()
+        with profiler.stage("build", trace=True, args={"x": 1}):
+            pass
+        with profiler.stage("hot"):
+            pass
+        self.assertEqual([event["name"] for event in profiler.events], ["build"])
+        self.assertEqual(profiler.events[0]["ph"], "X")
+
+    def test_page_records_counters(self):
+        profiler = Profiler()
+        profiling.active = profiler
+        with profiler.page("content/index.md"):
+            markdown_to_html_node("# Title\n\nSome *text*\n\n* a\n* b")
+        page = profiler.pages[0]
+        self.assertEqual(page["path"], "content/index.md")
+        self.assertEqual(page["blocks"], 3)
+        self.assertEqual(page["textnodes"], 5)
+        self.assertIn("text_to_textnodes", profiler.stages)
+        self.assertIn("page", profiler.summary())
+
+    def test_merge(self):
+        first = Profiler()
+        second = Profiler()
+        with first.stage("page"):
+            pass
+        with second.stage("page"):
+            pass
+        second.count("blocks", 4)
+        first.merge(second.to_dict())
+        self.assertEqual(first.stages["page"]["calls"], 2)
+        self.assertEqual(first.counters["blocks"], 4)
+
+    def test_inactive_is_noop(self):
+        with profiling.stage("anything"):
+            pass
+        self.assertIsNone(profiling.active)
+
+
+if __name__ == "__main__":
+    unittest.main()
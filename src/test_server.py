@@ -0,0 +1,77 @@
+import os
+import struct
+import threading
+import unittest
+from server import Reloader, SiteBuilder, Watcher, diff_snapshots
+from sitefixture import SiteTestCase
+
+
+class TestDiffSnapshots(unittest.TestCase):
+    def test_added_changed_removed(self):
+        old = {"a": (1, 10), "b": (1, 10), "c": (1, 10)}
+        new = {"a": (1, 10), "b": (2, 10), "d": (1, 5)}
+        self.assertEqual(diff_snapshots(old, new), {"b", "c", "d"})
+
+
+class TestReloader(unittest.TestCase):
+    def test_wait_returns_new_version(self):
+        reloader = Reloader()
+        threading.Timer(0.01, reloader.notify).start()
+        self.assertEqual(reloader.wait(0, timeout=5), 1)
+
+    def test_wait_times_out(self):
+        reloader = Reloader()
+        self.assertEqual(reloader.wait(0, timeout=0.01), 0)
+
+
+class TestSiteBuilder(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "about.md"), "# About\n\nUs")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(self.template, "{{ Content }}")
+        self.builder = SiteBuilder(self.content, self.static, self.template, self.public, self.manifest)
+        self.builder.build()
+        self.watcher = Watcher([self.content, self.static, self.template])
+
+    def test_rebuilds_only_changed_page(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nEdited")
+        changed = self.watcher.poll()
+        self.assertEqual(changed, {os.path.join(self.content, "index.md")})
+        self.assertEqual(self.builder.rebuild(changed), 1)
+        self.assertEqual(self.read(os.path.join(self.public, "index.html")), "<div><h1>Home</h1><p>Edited</p></div>")
+
+    def test_template_change_rebuilds_every_page(self):
+        self.write(self.template, "<main>{{ Content }}</main>")
+        self.assertEqual(self.builder.rebuild(self.watcher.poll()), 2)
+        self.assertTrue(self.read(os.path.join(self.public, "about.html")).startswith("<main>"))
+
+    def test_deleted_sources_remove_outputs(self):
+        os.remove(os.path.join(self.content, "about.md"))
+        os.remove(os.path.join(self.static, "index.css"))
+        self.builder.rebuild(self.watcher.poll())
+        self.assertFalse(os.path.exists(os.path.join(self.public, "about.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.css")))
+        self.assertNotIn(os.path.join(self.content, "about.md"), self.builder.manifest.pages)
+
+    def test_static_change_is_copied(self):
+        self.write(os.path.join(self.static, "index.css"), "body { color: red }")
+        self.builder.rebuild(self.watcher.poll())
+        self.assertEqual(self.read(os.path.join(self.public, "index.css")), "body { color: red }")
+
+    def test_image_size_change_rebuilds_pages_using_it(self):
+        image = os.path.join(self.static, "a.png")
+        self.write_png(image, 10, 20)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n![pic](/a.png)")
+        self.builder.rebuild(self.watcher.poll())
+        self.assertIn('width="10" height="20"', self.read(os.path.join(self.public, "index.html")))
+        self.write_png(image, 30, 40)
+        self.assertEqual(self.builder.rebuild(self.watcher.poll()), 2)
+        self.assertIn('width="30" height="40"', self.read(os.path.join(self.public, "index.html")))
+
+    def write_png(self, path, width, height):
+        self.write(path, b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR" + struct.pack(">II", width, height))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import unittest
+from build import build_site
+from shard import merge_shards, parse_shard, plan_shards, select_shard, shard_build_path
+from siteindex import SiteIndex
+from sitefixture import SiteTestCase
+
+
+class TestShardPlan(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for text in ("0/4", "5/4", "2", "a/b", "-1/2"):
+            with self.assertRaises(ValueError):
+                parse_shard(text)
+
+    def test_shard_build_path(self):
+        self.assertEqual(shard_build_path(os.path.join(".build", "manifest.json"), 2, 4), os.path.join(".build-shard-2-of-4", "manifest.json"))
+
+    def test_hash_plan_partitions_pages(self):
+        pages = [(os.path.join("content", f"p{i}.md"), os.path.join("public", f"p{i}.html")) for i in range(50)]
+        shards = [select_shard(pages, "content", i, 3) for i in (1, 2, 3)]
+        self.assertEqual(sorted(page for shard in shards for page in shard), sorted(pages))
+        self.assertTrue(all(shards))
+        self.assertEqual(plan_shards(pages, "content", 3), plan_shards(list(reversed(pages)), "content", 3))
+
+    def test_size_plan_balances(self):
+        with tempfile.TemporaryDirectory() as root:
+            pages = []
+            for i, size in enumerate((900, 500, 400, 300, 200, 100)):
+                src = os.path.join(root, f"p{i}.md")
+                with open(src, "w") as f:
+                    f.write("x" * size)
+                pages.append((src, src + ".html"))
+            assignment = plan_shards(pages, root, 2, "size")
+        loads = {1: 0, 2: 0}
+        for (src, _), size in zip(pages, (900, 500, 400, 300, 200, 100)):
+            loads[assignment[src]] += size
+        self.assertEqual(loads, {1: 1200, 2: 1200})
+
+
+class TestShardBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(8):
+            self.write(os.path.join(self.content, f"p{i}", "index.md"), f"# Page {i}\n\n[next](/p{(i + 1) % 8}/)")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(self.template, "{{ Content }}")
+
+    def build_shards(self, count):
+        shard_paths, index_paths = [], []
+        for i in range(1, count + 1):
+            dest = os.path.join(self.root, f"public-{i}")
+            manifest = os.path.join(self.root, f"build-{i}", "manifest.json")
+            stats = build_site(self.content, self.static, self.template, dest, False, manifest, shard=(i, count))
+            # Links into other shards resolve against the whole site.
+            self.assertEqual(stats["broken_links"], [])
+            shard_paths.append(dest)
+            index_paths.append(os.path.join(self.root, f"build-{i}", "site-index.json"))
+        return shard_paths, index_paths
+
+    def test_merge_matches_single_build(self):
+        shard_paths, index_paths = self.build_shards(3)
+        index_path = os.path.join(self.root, "site-index.json")
+        stats = merge_shards(shard_paths, self.public, index_paths, index_path)
+        self.assertEqual(stats["files"], 9)
+        single = os.path.join(self.root, "single")
+        build_site(self.content, self.static, self.template, single, False, os.path.join(self.root, "single-build", "manifest.json"))
+        for i in range(8):
+            with open(os.path.join(self.public, f"p{i}", "index.html")) as merged, open(os.path.join(single, f"p{i}", "index.html")) as expected:
+                self.assertEqual(merged.read(), expected.read())
+        index = SiteIndex.load(index_path)
+        self.assertEqual(len(index.pages), 8)
+        self.assertTrue(all(entry["output"].startswith(self.public) for entry in index.pages.values()))
+
+    def test_later_builds_leave_shard_trees_intact(self):
+        shard_paths, _ = self.build_shards(2)
+        merge_shards(shard_paths, self.public)
+        snapshot = {}
+        for shard_path in shard_paths:
+            for root, _, names in os.walk(shard_path):
+                for name in names:
+                    with open(os.path.join(root, name)) as f:
+                        snapshot[os.path.join(root, name)] = f.read()
+        self.write(self.template, "<main>{{ Content }}</main>")
+        build_site(self.content, self.static, self.template, self.public, False, os.path.join(self.root, "build", "manifest.json"))
+        for path, text in snapshot.items():
+            with open(path) as f:
+                self.assertEqual(f.read(), text, path)
+
+    def test_conflicting_outputs_rejected(self):
+        shard_paths, _ = self.build_shards(2)
+        # Outputs are hardlinked to static/, so replace the file rather than edit it.
+        os.remove(os.path.join(shard_paths[1], "index.css"))
+        self.write(os.path.join(shard_paths[1], "index.css"), "body { color: red }")
+        with self.assertRaises(ValueError):
+            merge_shards(shard_paths, self.public)
+
+    def test_missing_shard_rejected_before_pruning(self):
+        shard_paths, index_paths = self.build_shards(2)
+        index_path = os.path.join(self.root, "site-index.json")
+        merge_shards(shard_paths, self.public, index_paths, index_path)
+        shutil.rmtree(shard_paths[1])
+        with self.assertRaises(ValueError):
+            merge_shards(shard_paths, self.public, index_paths, index_path)
+        self.build_shards(2)
+        os.remove(index_paths[0])
+        with self.assertRaises(ValueError):
+            merge_shards(shard_paths, self.public, index_paths, index_path)
+        self.assertEqual(len(SiteIndex.load(index_path).pages), 8)
+        for i in range(8):
+            self.assertTrue(os.path.exists(os.path.join(self.public, f"p{i}", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
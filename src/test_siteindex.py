@@ -0,0 +1,73 @@
+import json
+import os
+import unittest
+import siteindex
+from blockcache import BlockCache
+from helpers import markdown_to_html_node
+from siteindex import PageRecord, SiteIndex, index_path_for, output_url
+from sitefixture import SiteTestCase
+
+
+class TestPageRecord(unittest.TestCase):
+    def tearDown(self):
+        siteindex.active = None
+
+    def test_records_links_and_images(self):
+        siteindex.active = PageRecord()
+        markdown_to_html_node("See [docs](/docs/) and ![logo](/logo.png)\n\n- [a](/a)\n- [b](https://example.com)")
+        self.assertEqual(siteindex.active.links, ["/docs/", "/a", "https://example.com"])
+        self.assertEqual(siteindex.active.images, ["/logo.png"])
+
+    def test_cache_hits_still_record(self):
+        cache = BlockCache(path=None)
+        markdown = "A [link](/x) here\n\n![img](/y.png)"
+        markdown_to_html_node(markdown, cache)
+        siteindex.active = PageRecord()
+        markdown_to_html_node(markdown, cache)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(siteindex.active.links, ["/x"])
+        self.assertEqual(siteindex.active.images, ["/y.png"])
+
+    def test_output_url(self):
+        self.assertEqual(output_url(os.path.join("public", "index.html"), "public"), "/")
+        self.assertEqual(output_url(os.path.join("public", "blog", "index.html"), "public"), "/blog/")
+        self.assertEqual(output_url(os.path.join("public", "about.html"), "public"), "/about.html")
+
+
+class TestSiteIndexBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.index_path = index_path_for(self.manifest)
+        os.makedirs(self.static)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nGo to [the post](/blog/).")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Post\n\n![photo](/images/p.png)")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+
+    def test_index_written_next_to_manifest(self):
+        stats = self.build()
+        home = os.path.join(self.content, "index.md")
+        entry = stats["index"].pages[home]
+        self.assertEqual(entry["title"], "Home")
+        self.assertEqual(entry["links"], ["/blog/"])
+        self.assertEqual(entry["bytes"], os.path.getsize(home))
+        with open(self.index_path) as f:
+            self.assertEqual(json.load(f), stats["index"].pages)
+        self.assertEqual(sorted(stats["index"].by_url(self.public)), ["/", "/blog/"])
+
+    def test_incremental_keeps_skipped_and_drops_removed(self):
+        self.build()
+        post = os.path.join(self.content, "blog", "index.md")
+        self.write(os.path.join(self.content, "about.md"), "# About\n\n[home](/)")
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 1)
+        index = SiteIndex.load(self.index_path)
+        self.assertEqual(index.pages[post]["images"], ["/images/p.png"])
+        self.assertEqual(index.pages[os.path.join(self.content, "about.md")]["title"], "About")
+        os.remove(post)
+        index = self.build()["index"]
+        self.assertNotIn(post, index.pages)
+        self.assertEqual(len(index.pages), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import io
+import os
+import tempfile
+import unittest
+from htmlnode import LeafNode, ParentNode
+from template import Template, load_template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_split_into_segments_and_slots(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.segments, ["<title>", "</title><body>", "</body>"])
+        self.assertEqual(template.slots, ["Title", "Content"])
+
+    def test_render(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        self.assertEqual(template.render({"Title": "Hi", "Content": "<p>x</p>"}), "<title>Hi</title><p>x</p>")
+
+    def test_repeated_slot(self):
+        template = Template("{{ Title }} - {{ Title }}")
+        self.assertEqual(template.render({"Title": "Hi"}), "Hi - Hi")
+
+    def test_arbitrary_slot(self):
+        template = Template("<meta name=\"author\" content=\"{{ Author }}\">")
+        self.assertEqual(template.render({"Author": "Tolkien"}), "<meta name=\"author\" content=\"Tolkien\">")
+
+    def test_missing_value_left_verbatim(self):
+        template = Template("<nav>{{ Menu }}</nav>")
+        self.assertEqual(template.render({}), "<nav>{{ Menu }}</nav>")
+
+    def test_no_slots(self):
+        template = Template("<p>static</p>")
+        self.assertEqual(template.render({"Title": "unused"}), "<p>static</p>")
+
+    def test_write(self):
+        template = Template("<h1>{{ Title }}</h1>")
+        out = io.StringIO()
+        template.write(out, {"Title": "Hi"})
+        self.assertEqual(out.getvalue(), "<h1>Hi</h1>")
+
+    def test_write_streams_nodes(self):
+        template = Template("<article>{{ Content }}</article>")
+        out = io.StringIO()
+        template.write(out, {"Content": ParentNode("p", [LeafNode("b", "hi")])})
+        self.assertEqual(out.getvalue(), "<article><p><b>hi</b></p></article>")
+
+    def test_load_template_cached_until_modified(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as f:
+                f.write("{{ Title }}")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, "w") as f:
+                f.write("<b>{{ Title }}</b>")
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            self.assertEqual(load_template(path).render({"Title": "x"}), "<b>x</b>")
+
+
+if __name__ == "__main__":
+    unittest.main()
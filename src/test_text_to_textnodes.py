@@ -19,4 +19,57 @@ class TestSplitNodesLink(unittest.TestCase):
             TextNode("link", TextType.LINK, "https://boot.dev"),
         ]
 
-        self.assertEqual(new_nodes, expected_nodes)
\ No newline at end of file
+        self.assertEqual(new_nodes, expected_nodes)
+
+    def test_no_emphasis_inside_code(self):
+        new_nodes = text_to_textnodes("Use `a * b ** c` here")
+        expected_nodes = [
+            TextNode("Use ", TextType.TEXT),
+            TextNode("a * b ** c", TextType.CODE),
+            TextNode(" here", TextType.TEXT),
+        ]
+        self.assertEqual(new_nodes, expected_nodes)
+
+    def test_no_link_inside_code(self):
+        new_nodes = text_to_textnodes("`[link](https://boot.dev)`")
+        self.assertEqual(new_nodes, [TextNode("[link](https://boot.dev)", TextType.CODE)])
+
+    def test_unmatched_delimiter_is_text(self):
+        new_nodes = text_to_textnodes("2 * 3 = 6 and `x")
+        self.assertEqual(new_nodes, [TextNode("2 * 3 = 6 and `x", TextType.TEXT)])
+
+    def test_adjacent_spans(self):
+        new_nodes = text_to_textnodes("**bold***italic*`code`")
+        expected_nodes = [
+            TextNode("bold", TextType.BOLD),
+            TextNode("italic", TextType.ITALIC),
+            TextNode("code", TextType.CODE),
+        ]
+        self.assertEqual(new_nodes, expected_nodes)
+
+    def test_italic_inside_bold(self):
+        new_nodes = text_to_textnodes("use **x *y* z** and *d*")
+        expected_nodes = [
+            TextNode("use ", TextType.TEXT),
+            TextNode("x ", TextType.BOLD),
+            TextNode("y", TextType.ITALIC),
+            TextNode(" z", TextType.BOLD),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("d", TextType.ITALIC),
+        ]
+        self.assertEqual(new_nodes, expected_nodes)
+
+    def test_bold_inside_italic(self):
+        new_nodes = text_to_textnodes("*x **y** z*")
+        expected_nodes = [
+            TextNode("x ", TextType.ITALIC),
+            TextNode("y", TextType.BOLD),
+            TextNode(" z", TextType.ITALIC),
+        ]
+        self.assertEqual(new_nodes, expected_nodes)
+
+    def test_unpaired_star_inside_bold_is_text(self):
+        self.assertEqual(text_to_textnodes("**2 * 3**"), [TextNode("2 * 3", TextType.BOLD)])
+
+    def test_plain_text(self):
+        self.assertEqual(text_to_textnodes("just text"), [TextNode("just text", TextType.TEXT)])
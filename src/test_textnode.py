@@ -4,6 +4,7 @@ from enum import Enum
 from textnode import TextNode, TextType
 from htmlnode import LeafNode
 from textnode import text_node_to_html_node
+import imagesize
 
 
 class TestTextNode(unittest.TestCase):
@@ -36,6 +37,12 @@ class TestTextNode(unittest.TestCase):
         node = TextNode("This is a text node", TextType.BOLD)
         self.assertEqual(repr(node), "TextNode(This is a text node, TextType.BOLD, None)")
 
+    def test_slotted(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = 1
+
     # text_node_to_html_node function tests
     def test_text_node_to_html_node_text(self):
         text_node = TextNode("This is a text node", TextType.TEXT)
@@ -65,7 +72,20 @@ class TestTextNode(unittest.TestCase):
     def test_text_node_to_html_node_image(self):
         text_node = TextNode("This is an image", TextType.IMAGE, "http://example.com/image.png")
         html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node.to_html(), LeafNode(tag="img", value="This is an image", props={"src": "http://example.com/image.png"}).to_html())
+        self.assertEqual(html_node.to_html(), '<img src="http://example.com/image.png" alt="This is an image" loading="lazy" decoding="async">')
+
+    def test_text_node_to_html_node_image_dimensions(self):
+        imagesize.active = {"/images/a.png": (640, 480)}
+        try:
+            html_node = text_node_to_html_node(TextNode('A "quoted" image', TextType.IMAGE, "/images/a.png"))
+        finally:
+            imagesize.active = None
+        self.assertEqual(html_node.to_html(), '<img src="/images/a.png" alt="A &quot;quoted&quot; image" width="640" height="480" loading="lazy" decoding="async">')
+
+    def test_to_html_matches_leaf_node(self):
+        for text_type in TextType:
+            text_node = TextNode("Some <text> & more", text_type, "/url")
+            self.assertEqual(text_node.to_html(), text_node_to_html_node(text_node).to_html())
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import toc
+from blockcache import BlockCache
+from helpers import generate_page, markdown_to_html_node
+from htmlnode import ParentNode
+from textnode import TextNode, TextType
+from toc import TableOfContents, slugify
+
+
+class TestSlugs(unittest.TestCase):
+    def test_slugify(self):
+        self.assertEqual(slugify("The Struggle of Good vs. Evil"), "the-struggle-of-good-vs-evil")
+        self.assertEqual(slugify("  --Hello__World--  "), "hello-world")
+        self.assertEqual(slugify("Númenor & Gondor"), "númenor-gondor")
+        self.assertEqual(slugify("!!!"), "section")
+
+    def test_duplicates_get_suffixes(self):
+        contents = TableOfContents()
+        slugs = [contents.add(2, [TextNode(text, TextType.TEXT)]) for text in ("Intro", "Intro", "Intro 1", "Intro")]
+        self.assertEqual(slugs, ["intro", "intro-1", "intro-1-1", "intro-2"])
+
+    def test_slug_uses_text_of_inline_nodes(self):
+        contents = TableOfContents()
+        self.assertEqual(contents.add(2, [TextNode("The ", TextType.TEXT), TextNode("Ring", TextType.BOLD)]), "the-ring")
+
+
+class TestTableOfContents(unittest.TestCase):
+    def toc_html(self, levels):
+        contents = TableOfContents()
+        for i, level in enumerate(levels):
+            contents.add(level, [TextNode(f"h{i}", TextType.TEXT)])
+        return contents.to_html()
+
+    def test_nesting(self):
+        self.assertEqual(
+            self.toc_html([1, 2, 3, 2, 1]),
+            '<ul><li><a href="#h0">h0</a><ul><li><a href="#h1">h1</a><ul><li><a href="#h2">h2</a></li></ul></li>'
+            '<li><a href="#h3">h3</a></li></ul></li><li><a href="#h4">h4</a></li></ul>',
+        )
+
+    def test_skipped_and_shallower_levels(self):
+        self.assertEqual(
+            self.toc_html([3, 2, 4]),
+            '<ul><li><a href="#h0">h0</a></li><li><a href="#h1">h1</a><ul><li><a href="#h2">h2</a></li></ul></li></ul>',
+        )
+
+    def test_empty(self):
+        self.assertEqual(TableOfContents().to_node(), "")
+
+
+class TestHeadingAnchors(unittest.TestCase):
+    def tearDown(self):
+        toc.active = None
+
+    def test_ids_only_while_collecting(self):
+        self.assertEqual(markdown_to_html_node("## Intro").to_html(), "<div><h2>Intro</h2></div>")
+        toc.active = TableOfContents()
+        self.assertEqual(markdown_to_html_node("## Intro\n\n## Intro").to_html(), '<div><h2 id="intro">Intro</h2><h2 id="intro-1">Intro</h2></div>')
+
+    def test_cached_headings_are_not_reused(self):
+        cache = BlockCache(path=None)
+        toc.active = TableOfContents()
+        markdown_to_html_node("## Intro", cache)
+        self.assertEqual(markdown_to_html_node("## Intro", cache).to_html(), '<div><h2 id="intro-1">Intro</h2></div>')
+
+    def test_template_slot(self):
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, "page.md")
+            template = os.path.join(root, "template.html")
+            dest = os.path.join(root, "page.html")
+            with open(src, "w") as f:
+                f.write("# Title\n\n## Part one\n\ntext\n\n### Detail")
+            with open(template, "w") as f:
+                f.write("<nav>{{ Toc }}</nav>{{ Content }}")
+            generate_page(src, template, dest)
+            with open(dest) as f:
+                html = f.read()
+        self.assertEqual(
+            html,
+            '<nav><ul><li><a href="#title">Title</a><ul><li><a href="#part-one">Part one</a><ul><li><a href="#detail">Detail</a></li></ul></li></ul></li></ul></nav>'
+            '<div><h1 id="title">Title</h1><h2 id="part-one">Part one</h2><p>text</p><h3 id="detail">Detail</h3></div>',
+        )
+        self.assertIsNone(toc.active)
+
+    def test_template_slot_after_content(self):
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, "page.md")
+            template = os.path.join(root, "template.html")
+            dest = os.path.join(root, "page.html")
+            with open(src, "w") as f:
+                f.write("# Title\n\n## Part one")
+            with open(template, "w") as f:
+                f.write("{{ Content }}<nav>{{ Toc }}</nav>")
+            with mock.patch.object(ParentNode, "to_html", side_effect=AssertionError("content rendered ahead of the writer")):
+                generate_page(src, template, dest)
+            with open(dest) as f:
+                html = f.read()
+        self.assertEqual(
+            html,
+            '<div><h1 id="title">Title</h1><h2 id="part-one">Part one</h2></div>'
+            '<nav><ul><li><a href="#title">Title</a><ul><li><a href="#part-one">Part one</a></li></ul></li></ul></nav>',
+        )
+
+    def test_deferred_node_without_headings(self):
+        self.assertEqual(TableOfContents().deferred_node().to_html(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from writer import OutputWriter, write_if_changed
+
+
+class TestWriteIfChanged(unittest.TestCase):
+    def test_writes_and_skips_identical(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.html")
+            self.assertTrue(write_if_changed(path, b"<p>a</p>"))
+            mtime = os.stat(path).st_mtime_ns
+            self.assertFalse(write_if_changed(path, b"<p>a</p>"))
+            self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+            self.assertTrue(write_if_changed(path, b"<p>b</p>"))
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"<p>b</p>")
+            self.assertEqual(os.listdir(tmp), ["page.html"])
+
+
+class TestOutputWriter(unittest.TestCase):
+    def test_writes_queued_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with OutputWriter(threads=3, max_pending=2) as writer:
+                for i in range(20):
+                    writer.submit(os.path.join(tmp, f"dir{i % 4}", f"page{i}.html"), f"{i}".encode())
+            self.assertEqual(writer.written, 20)
+            with open(os.path.join(tmp, "dir3", "page7.html"), "rb") as f:
+                self.assertEqual(f.read(), b"7")
+            with OutputWriter() as writer:
+                writer.submit(os.path.join(tmp, "dir3", "page7.html"), b"7")
+            self.assertEqual((writer.written, writer.unchanged), (0, 1))
+
+    def test_errors_raised_on_close(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            blocker = os.path.join(tmp, "file")
+            with open(blocker, "w") as f:
+                f.write("x")
+            writer = OutputWriter(threads=1)
+            writer.submit(os.path.join(blocker, "page.html"), b"x")
+            with self.assertRaises(OSError):
+                writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
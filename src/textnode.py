@@ -1,5 +1,7 @@
 from enum import Enum
-from htmlnode import LeafNode
+from htmlnode import LeafNode, VoidNode
+import fingerprint
+import imagesize
 
 class TextType(Enum):
     TEXT = 1
@@ -10,7 +12,19 @@ class TextType(Enum):
     IMAGE = 6
 
 
+# Open and close tags for the types that render without attributes, so
+# to_html can skip building a LeafNode for the bulk of inline text.
+INLINE_TAGS = {
+    TextType.TEXT: ("", ""),
+    TextType.BOLD: ("<b>", "</b>"),
+    TextType.ITALIC: ("<i>", "</i>"),
+    TextType.CODE: ("<code>", "</code>"),
+}
+
+
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text: str, text_type: TextType, url: str = None):
         self.text = text
         self.text_type = text_type
@@ -23,7 +37,13 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type}, {self.url})"
 
     def to_html(self):
-        return text_node_to_html_node(self).to_html()
+        tags = INLINE_TAGS.get(self.text_type)
+        if tags is None:
+            return text_node_to_html_node(self).to_html()
+        return tags[0] + self.text + tags[1]
+
+    def iter_html(self):
+        yield self.to_html()
 
 def text_node_to_html_node(text_node):
     match text_node.text_type:
@@ -36,6 +56,18 @@ def text_node_to_html_node(text_node):
         case TextType.CODE:
             return LeafNode(tag="code", value=text_node.text)
         case TextType.LINK:
-            return LeafNode(tag="a", value=text_node.text, props={"href": text_node.url})
+            return LeafNode(tag="a", value=text_node.text, props={"href": fingerprint.resolve(text_node.url)})
         case TextType.IMAGE:
-            return LeafNode(tag="img", value=text_node.text, props={"src": text_node.url})
+            return VoidNode(tag="img", props=image_props(text_node))
+
+
+def image_props(text_node: TextNode) -> dict[str, str]:
+    props = {"src": fingerprint.resolve(text_node.url), "alt": text_node.text.replace('"', "&quot;")}
+    # Dimensions are looked up by the URL as written, before fingerprinting.
+    dimensions = imagesize.lookup(text_node.url)
+    if dimensions is not None:
+        props["width"] = str(dimensions[0])
+        props["height"] = str(dimensions[1])
+    props["loading"] = "lazy"
+    props["decoding"] = "async"
+    return props
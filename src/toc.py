@@ -0,0 +1,120 @@
+from typing import List
+from htmlnode import HTMLNode, LeafNode
+from textnode import TextNode, TextType
+
+
+class SlugTable(dict):
+    # str.translate table built lazily: letters and digits are kept,
+    # whitespace, "_" and "-" become "-", everything else is dropped.
+    def __missing__(self, code: int) -> str | None:
+        char = chr(code)
+        if char.isalnum():
+            value = char
+        elif char.isspace() or char in "_-":
+            value = "-"
+        else:
+            value = None
+        self[code] = value
+        return value
+
+
+SLUG_TABLE = SlugTable()
+# ASCII heading text, nearly all of it, is slugged with bytes.translate and
+# a 256-byte table that also folds case; it is several times cheaper than
+# str.translate with a mapping. Other text goes through slugify.
+ASCII_SLUG_BYTES = bytes(ord(SLUG_TABLE[ord(chr(code).lower())] or " ") if code < 128 else code for code in range(256))
+ASCII_SLUG_DELETE = bytes(code for code in range(128) if SLUG_TABLE[ord(chr(code).lower())] is None)
+
+
+def slugify(text: str) -> str:
+    slug = "-".join(filter(None, text.lower().translate(SLUG_TABLE).split("-")))
+    return slug or "section"
+
+
+class TableOfContents:
+    __slots__ = ("entries", "counts")
+
+    def __init__(self):
+        self.entries: List[tuple[int, str, str]] = []
+        # Times each slug has been handed out on this page, for "-1", "-2" suffixes.
+        self.counts: dict[str, int] = {}
+
+    def add(self, level: int, nodes: List[TextNode]) -> str:
+        self.heading(level, nodes)
+        return self.entries[-1][1]
+
+    def heading(self, level: int, nodes: List[TextNode]) -> LeafNode:
+        # Records the heading and renders it to one string, since it is final
+        # once its slug is known. This runs once per heading on every page
+        # with a TOC, so the common cases are kept inline.
+        if len(nodes) == 1 and nodes[0].text_type is TextType.TEXT:
+            text = inner = nodes[0].text
+        else:
+            text = "".join([node.text for node in nodes])
+            inner = "".join([node.to_html() for node in nodes])
+        slug = text.encode().translate(ASCII_SLUG_BYTES, ASCII_SLUG_DELETE).decode().strip("-") if text.isascii() else ""
+        # Only an empty slug or a run of "-" needs the general path.
+        if not slug or "--" in slug:
+            slug = slugify(text)
+        counts = self.counts
+        if slug in counts:
+            base = slug
+            while slug in counts:
+                counts[base] += 1
+                slug = f"{base}-{counts[base]}"
+        counts[slug] = 0
+        self.entries.append((level, slug, text))
+        return LeafNode(None, f'<h{level} id="{slug}">{inner}</h{level}>')
+
+    def deferred_node(self) -> 'DeferredTocNode':
+        return DeferredTocNode(self)
+
+    def to_node(self) -> HTMLNode | str:
+        if not self.entries:
+            return ""
+        return LeafNode(tag=None, value=self.to_html())
+
+    def to_html(self) -> str:
+        # Nested lists are emitted in one walk over the entries; a heading
+        # nests under the closest preceding heading of a smaller level, so
+        # skipped levels still nest. stack holds the levels of open <li>s.
+        parts = ["<ul>"]
+        append = parts.append
+        stack = []
+        for level, slug, text in self.entries:
+            if stack and stack[-1] >= level:
+                stack.pop()
+                append("</li>")
+                while stack and stack[-1] >= level:
+                    stack.pop()
+                    append("</ul></li>")
+            elif stack:
+                append("<ul>")
+            append(f'<li><a href="#{slug}">{text}</a>')
+            stack.append(level)
+        append("</li></ul>" * len(stack))
+        return "".join(parts)
+
+    def __repr__(self):
+        return f"TableOfContents({len(self.entries)} headings)"
+
+
+class DeferredTocNode(HTMLNode):
+    __slots__ = ()
+
+    # Renders the TOC only when the template writer reaches it, so a
+    # {{ Toc }} placed after {{ Content }} lists every heading without the
+    # content being rendered ahead of time.
+    def __init__(self, contents: TableOfContents):
+        super().__init__(None, contents)
+
+    def to_html(self):
+        return self.value.to_html() if self.value.entries else ""
+
+    def __repr__(self):
+        return f"DeferredTocNode({self.value})"
+
+
+# Collects headings for the page being rendered while the template asks for
+# a {{ Toc }}; headings get id anchors only while this is set.
+active: TableOfContents | None = None
@@ -0,0 +1,80 @@
+import os
+import queue
+import threading
+from typing import List
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    # Readers (and rsync) only ever see the old file or the complete new one.
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+class OutputWriter:
+    def __init__(self, threads: int=4, max_pending: int=64):
+        # A bounded queue makes the renderer wait rather than buffer the site.
+        self.queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.lock = threading.Lock()
+        self.created_dirs: set[str] = set()
+        self.written = 0
+        self.unchanged = 0
+        self.errors: List[OSError] = []
+        self.threads = [threading.Thread(target=self.drain, daemon=True) for _ in range(max(1, threads))]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, path: str, data: bytes):
+        self.queue.put((path, data))
+
+    def drain(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            path, data = item
+            try:
+                self.ensure_dir(os.path.dirname(path))
+                changed = write_if_changed(path, data)
+            except OSError as e:
+                with self.lock:
+                    self.errors.append(e)
+                continue
+            with self.lock:
+                if changed:
+                    self.written += 1
+                else:
+                    self.unchanged += 1
+
+    def ensure_dir(self, directory: str):
+        if not directory or directory in self.created_dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            self.created_dirs.add(directory)
+
+    def close(self):
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.errors:
+            raise self.errors[0]
+
+    def __enter__(self) -> 'OutputWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return f"OutputWriter({self.written} written, {self.unchanged} unchanged)"